@@ -1,7 +1,9 @@
 import os
+import asyncio
 import datetime
 from mcp.server.fastmcp import FastMCP
 from ipc.airlock import UnityAirlock
+from ipc.async_airlock import AsyncUnityAirlock
 from vibe_logging.logger import VibeLogger
 from core.workspace import VibeWorkspaceManager
 
@@ -15,6 +17,7 @@ class VibeEngine:
         self.project_path = self.workspace.get_active_path()
         self.logger = VibeLogger(self.project_path)
         self.airlock = UnityAirlock(self.project_path, self.logger, self.workspace)
+        self.async_airlock = AsyncUnityAirlock(self.airlock)
         
         self.activity_file = os.path.join(self.bridge_root, "metadata", "bridge_activity.txt")
         self._ensure_infrastructure()
@@ -35,12 +38,21 @@ class VibeEngine:
         if self.workspace.set_active_project(name):
             self.project_path = self.workspace.get_active_path()
             # Re-initialize context for the new project
+            self.logger.close() # Drains queued WAL entries into the old project
             self.logger = VibeLogger(self.project_path)
+            self.airlock.close()
+            self._close_async_airlock()
             self.airlock = UnityAirlock(self.project_path, self.logger)
+            self.async_airlock = AsyncUnityAirlock(self.airlock)
             self._ensure_infrastructure()
             return True
         return False
 
+    def _close_async_airlock(self):
+        try:
+            asyncio.get_running_loop().create_task(self.async_airlock.aclose())
+        except RuntimeError: pass # No loop running, nothing was opened on it
+
     def set_activity(self, label):
         """Writes a visible thought marker for the human operator."""
         try:
@@ -54,5 +66,12 @@ class VibeEngine:
         self.set_activity("IDLE")
         return res
 
+    async def async_unity_request(self, path, params=None, is_mutation=False, intent=None):
+        """Non-blocking variant of unity_request for async tool handlers."""
+        if intent: self.set_activity(f"AI_{intent}: {path}")
+        res = await self.async_airlock.request(path, params, is_mutation, intent)
+        self.set_activity("IDLE")
+        return res
+
     def run(self):
         self.mcp.run()
@@ -1,7 +1,6 @@
 import os
 import json
 import uuid
-import time
 import requests
 import datetime
 import sys
@@ -16,6 +15,14 @@ except ImportError:
     from scripts.security_gate import SecurityGate
 
 from .sentinel import BinarySentinel
+from .transport import KernelTransport, TransportManager
+from .watcher import OutboxWatcher
+from .metadata_cache import MetadataCache
+from .readiness import ReadinessWaiter
+from .response_cache import ResponseCache
+from .singleflight import SingleFlight
+from .stream import StreamedPayload, is_ndjson, decode_ndjson
+from .recipe_audit import RecipeAuditor
 
 class UnityAirlock:
     def __init__(self, project_path, logger, workspace=None):
@@ -27,11 +34,57 @@ class UnityAirlock:
         self.outbox = os.path.join(project_path, "vibe_queue", "outbox")
         self.status_file = os.path.join(project_path, "metadata", "vibe_status.json")
         self.health_file = os.path.join(project_path, "metadata", "vibe_health.json")
+        self.settings_file = os.path.join(project_path, "metadata", "vibe_settings.json")
+        self.outbox_watcher = OutboxWatcher(self.outbox)
+        self.metadata = MetadataCache(project_path)
+
+        settings = self._load_settings()
+        perf = settings.get("performance", {})
+        self.transport = KernelTransport(pool_connections=perf.get("http_pool_connections", 4),
+                                         pool_maxsize=perf.get("http_pool_maxsize", 8))
+        self.transport_manager = TransportManager(self.transport, settings)
+        self.response_cache = ResponseCache(max_entries=perf.get("response_cache_entries", 256),
+                                            ttl=perf.get("response_cache_ttl", 10.0))
+        self.single_flight = SingleFlight()
+        self.readiness = ReadinessWaiter(self.metadata, deadline=perf.get("ready_wait_timeout", 10.0))
+        self.recipe_auditor = RecipeAuditor(max_workers=perf.get("recipe_audit_workers", 4),
+                                            deadline=perf.get("recipe_audit_deadline", 30.0))
         
         self.sentinel = BinarySentinel(project_path, logger)
-        self.sentinel.verify()
+        self.sentinel.start() # Hashes and watches in the background; mutations wait only while it is unknown
+        self.sentinel_wait = perf.get("sentinel_wait_timeout", 10.0)
+
+    def _load_settings(self):
+        if os.path.exists(self.settings_file):
+            try:
+                with open(self.settings_file, "r") as f: return json.load(f)
+            except: pass
+        return {}
+
+    def get_stats(self):
+        """Returns IPC performance counters for the management layer."""
+        return {
+            "transport": self.transport.get_stats(),
+            "routing": self.transport_manager.get_stats(),
+            "outbox": self.outbox_watcher.get_stats(),
+            "metadata": self.metadata.get_stats(),
+            "readiness": self.readiness.get_stats(),
+            "response_cache": self.response_cache.get_stats(),
+            "single_flight": self.single_flight.get_stats(),
+            "recipe_audit": self.recipe_auditor.get_stats(),
+            "sentinel": self.sentinel.get_stats()
+        }
 
-    def _audit_payload(self, path, params):
+    def close(self):
+        """Releases pooled kernel connections and file watchers (called on project switch)."""
+        self.transport_manager.close()
+        self.transport.close()
+        self.outbox_watcher.close()
+        self.readiness.close()
+        self.recipe_auditor.close()
+        self.sentinel.close()
+
+    def _audit_payload(self, path, params, cancelled=None):
         """Performs recursive in-memory AST and keyword analysis on tool parameters."""
         if not params: return []
         issues = []
@@ -41,11 +94,11 @@ class UnityAirlock:
         
         # 1. Scan all string parameters for C# and general security violations
         for key, value in params.items():
+            if cancelled is not None and cancelled.is_set(): break # Another sub-tool already failed the recipe
             if isinstance(value, str):
-                # Only check for C# if it looks like code (contains keywords or common patterns)
-                code_patterns = ["using ", "namespace ", "class ", "void ", "{", "public ", "static "]
-                if any(p in value for p in code_patterns):
-                    issues.extend(SecurityGate.check_csharp(value))
+                # Only compile what the lexical classifier scores as C# (JSON leaves are screened individually)
+                for snippet in SecurityGate.csharp_candidates(value):
+                    issues.extend(SecurityGate.check_csharp(snippet))
                 
                 # Check for path safety across all zones
                 if not SecurityGate.is_path_safe(value, safe_zones):
@@ -56,21 +109,202 @@ class UnityAirlock:
         # 2. Path-specific deep auditing
         if path == "system/execute-recipe":
             try:
-                recipe = json.loads(params.get("data", "{}"))
-                for tool in recipe.get("tools", []):
-                    # Recursive audit of tools within recipes
-                    issues.extend(self._audit_payload(tool.get("action"), 
-                                 dict(zip(tool.get("keys", []), tool.get("values", [])))))
+                issues.extend(self._audit_recipe(self._recipe_tools(params), cancelled))
             except:
                 issues.append("Security Violation: Malformed JSON in recipe data.")
 
         return [i for i in issues if i]
 
+    @staticmethod
+    def _recipe_tools(params):
+        """Sub-tools of an execute-recipe envelope. Raises on malformed JSON."""
+        # The kernel reads a bare command array from 'recipe'; legacy callers send {"tools": [...]} in 'data'
+        if "recipe" in params:
+            tools = json.loads(params["recipe"])
+        else:
+            tools = json.loads(params.get("data", "{}")).get("tools", [])
+        if not isinstance(tools, list) or not all(isinstance(t, dict) for t in tools):
+            raise ValueError("recipe is not a list of tools")
+        return tools
+
+    def _audit_recipe(self, tools, cancelled=None):
+        """Recursive audit of tools within recipes; top-level recipes fan out over the audit pool."""
+        def audit_tool(tool, cancelled):
+            return self._audit_payload(tool.get("action"),
+                                       dict(zip(tool.get("keys", []), tool.get("values", []))), cancelled)
+
+        if cancelled is None:
+            return self.recipe_auditor.run(tools, audit_tool)
+
+        # Nested recipes run inline on the worker that found them (nested fan-out could starve the pool)
+        for tool in tools:
+            if cancelled.is_set(): break
+            issues = audit_tool(tool, cancelled)
+            if issues: return issues # Fail fast, like the pool
+        return []
+
     def request(self, path, params=None, is_mutation=False, intent=None):
         """Secure AIRLOCK IPC with Triple-Lock, In-Process Auditing, and Smart-Wait."""
-        
+        blocked = self._preflight(path, params, is_mutation)
+        if blocked: return blocked
+
+        # Read-through cache: unchanged kernel state means an identical read gets an identical answer
+        if not is_mutation:
+            cached = self.response_cache.get(path, params)
+            if cached: return self._finalize(path, params, False, *cached)
+
+        capability = "Admin" if is_mutation else "Read"
+        token = self._get_token()
+
+        # --- REALITY FIX: SMART-WAIT FOR COMPILATION ---
+        # If we are mutating, wait for the 'Ready' transition (event-driven, bounded by the deadline).
+        if is_mutation:
+            status, _ = self.readiness.wait_until_ready()
+            if status == "VETOED":
+                return json.dumps({"error": "VETOED", "message": "Kernel locked by human veto."})
+
+        def fetch():
+            data, meta_wrapper = self._send(path, params, capability, token, is_mutation)
+            self._remember(path, params, is_mutation, data, meta_wrapper)
+            return data, meta_wrapper
+
+        # Identical reads already in flight share that round trip instead of queueing a duplicate
+        if is_mutation or not self.response_cache.is_cacheable(path):
+            data, meta_wrapper = fetch()
+        else:
+            data, meta_wrapper = self.single_flight.do(self.response_cache.key(path, params), fetch)
+        return self._finalize(path, params, is_mutation, data, meta_wrapper)
+
+    def request_many(self, commands, is_mutation=False, batch_size=50):
+        """
+        Packs a list of (path, params) commands into 'system/execute-recipe' envelopes so N
+        lookups cost ceil(N / batch_size) round trips. Returns one result per command, in order;
+        failed items carry an 'error' key instead of aborting the batch.
+        """
+        capability = "Admin" if is_mutation else "Read"
+        tools = [self._build_command(path, params, capability) for path, params in commands]
+        if is_mutation:
+            blocked = self._preflight_recipe(tools)
+            if blocked: return [json.loads(blocked) for _ in tools]
+            status, _ = self.readiness.wait_until_ready()
+            if status == "VETOED":
+                return [{"error": "VETOED", "message": "Kernel locked by human veto."} for _ in tools]
+
+        results = []
+        for start in range(0, len(tools), batch_size):
+            chunk = tools[start:start + batch_size]
+            envelope = {"recipe": json.dumps(chunk)}
+            data, meta_wrapper = self._send("system/execute-recipe", envelope, capability, self._get_token(), is_mutation)
+            self._remember("system/execute-recipe", envelope, is_mutation, data, meta_wrapper)
+            data = self._finalize("system/execute-recipe", envelope, is_mutation, data, meta_wrapper)
+            results.extend(self._split_batch(data, len(chunk)))
+        return results
+
+    def iter_items(self, path, params=None, key="objects"):
+        """
+        Yields the `key` array of a read response item by item. Over HTTP the NDJSON
+        body is decoded as it arrives, so the first objects of a large hierarchy page
+        are available before the rest is transferred. Error responses are yielded as-is.
+        """
+        resp = None
+        if self.transport_manager.route() == TransportManager.HTTP:
+            try:
+                cmd_payload = self._build_command(path, params, "Read")
+                resp = self.transport.post(self.transport_manager.port, "vibe", json.dumps(cmd_payload),
+                                           self._build_headers(self._get_token(), "Read"), timeout=5, stream=True,
+                                           idempotent=True)
+            except (requests.ConnectionError, requests.Timeout):
+                self.transport_manager.mark_http_failed()
+            except Exception:
+                pass
+
+        if resp is not None and resp.status_code == 200 and is_ndjson(resp.headers):
+            stream = StreamedPayload(resp.iter_content(65536), key)
+            try:
+                yield from stream
+            finally:
+                resp.close()
+            self.response_cache.observe_state(stream.meta.get("state"))
+            if isinstance(stream.data, dict) and stream.data.get("error"): yield stream.data
+            return
+        if resp is not None and resp.status_code == 200:
+            # Older kernel answered with a plain ResponseWrapper
+            data, meta_wrapper = self._unwrap_body(resp.headers, resp.content)
+            self._remember(path, params, False, data, meta_wrapper)
+            data = self._finalize(path, params, False, data, meta_wrapper)
+        else:
+            if resp is not None: resp.close()
+            data = self.request(path, params)
+        items = data.get(key) if isinstance(data, dict) else None
+        if items is None: yield data
+        else: yield from items
+
+    def _remember(self, path, params, is_mutation, data, meta_wrapper):
+        """Feeds a fresh kernel response into the response cache (or flushes it on mutation)."""
+        self.response_cache.observe_state(meta_wrapper.get("state"))
+        if is_mutation: self.response_cache.invalidate()
+        else: self.response_cache.put(path, params, data, meta_wrapper)
+
+    def _preflight_recipe(self, tools):
+        """Sentinel + recipe audit for a batch; items are audited individually, not as one JSON blob."""
+        blocked = self._preflight("system/execute-recipe", None, True)
+        if blocked: return blocked
+        audit_errors = [i for i in self._audit_recipe(tools) if i]
+        if audit_errors:
+            self.logger.log_intent("SECURITY_BLOCK", {"path": "system/execute-recipe", "errors": audit_errors})
+            return json.dumps({
+                "error": "SECURITY_VIOLATION",
+                "details": audit_errors,
+                "message": "Mutation blocked by In-Process Security Gate."
+            })
+        return None
+
+    def _split_batch(self, data, expected):
+        """Turns a finalized recipe response into exactly `expected` per-item results."""
+        items = data.get("results")
+        if not isinstance(items, list):
+            error = data.get("error") or "Malformed batch response."
+            return [{"error": error} for _ in range(expected)]
+
+        results = []
+        for item in items[:expected]:
+            if not isinstance(item, dict): item = {"results": item}
+            item["_monotonicTick"] = data.get("_monotonicTick", 0)
+            item["_engineState"] = data.get("_engineState", "UNKNOWN")
+            results.append(item)
+        while len(results) < expected:
+            results.append({"error": "Missing result in batch response."})
+        return results
+
+    def _send(self, path, params, capability, token, is_mutation):
+        """Delivers one command over HTTP, falling back to the file queue. Returns (data, meta_wrapper)."""
+        # Try HTTP first, unless it is known to be down
+        if self.transport_manager.route() == TransportManager.HTTP:
+            try:
+                # The kernel expects requests on /vibe via POST
+                cmd_payload = self._build_command(path, params, capability)
+                resp = self.transport.post(self.transport_manager.port, "vibe", json.dumps(cmd_payload), self._build_headers(token, capability),
+                                           timeout=5, idempotent=not is_mutation)
+                if resp.status_code == 200:
+                    return self._unwrap_body(resp.headers, resp.content)
+            except (requests.ConnectionError, requests.Timeout):
+                # Listener is down: stop paying this timeout until the background probe sees it again
+                self.transport_manager.mark_http_failed()
+            except Exception as e:
+                # print(f"HTTP Request failed: {e}")
+                pass
+
+        raw_wrapper = self._filesystem_request(path, params, capability, is_mutation)
+        self.transport_manager.mark_filesystem_result(not self._is_timeout(raw_wrapper))
+        return self._unwrap_filesystem(raw_wrapper)
+
+    def _is_timeout(self, raw_wrapper):
+        return isinstance(raw_wrapper, dict) and raw_wrapper.get("error") == "Timeout"
+
+    def _preflight(self, path, params, is_mutation):
+        """Runs the Binary Sentinel and Security Gate. Returns a JSON error if the call is blocked."""
         # --- LAYER -1: BINARY SENTINEL (Outside-In Integrity) ---
-        if is_mutation and not self.sentinel.is_verified:
+        if is_mutation and not self.sentinel.wait_until_known(self.sentinel_wait):
             report = self.sentinel.get_status_report()
             return json.dumps({
                 "error": "INTEGRITY_FAILURE",
@@ -81,7 +315,19 @@ class UnityAirlock:
 
         # --- LAYER 0: PRE-FLIGHT SECURITY GATE ---
         if is_mutation:
-            audit_errors = self._audit_payload(path, params)
+            if path == "system/execute-recipe" and params:
+                # A recipe envelope fans its sub-tools out over the pool (parallel, fail-fast, under the deadline)
+                try:
+                    tools = self._recipe_tools(params)
+                    envelope = {k: v for k, v in params.items() if k not in ("recipe", "data")}
+                    if envelope: tools = tools + [{"keys": list(envelope), "values": list(envelope.values())}]
+                    audit_errors = self._audit_recipe(tools)
+                except (ValueError, TypeError, AttributeError):
+                    audit_errors = ["Security Violation: Malformed JSON in recipe data."]
+            else:
+                # Same deadline as a recipe, as a one-tool batch
+                audit_errors = self.recipe_auditor.run([params], lambda p, cancelled: self._audit_payload(path, p, cancelled),
+                                                       kind="mutations") if params else []
             if audit_errors:
                 self.logger.log_intent("SECURITY_BLOCK", {"path": path, "errors": audit_errors})
                 return json.dumps({
@@ -89,61 +335,52 @@ class UnityAirlock:
                     "details": audit_errors,
                     "message": "Mutation blocked by In-Process Security Gate."
                 })
+        return None
 
-        capability = "Admin" if is_mutation else "Read"
-        token = self._get_token()
-        
-        # --- REALITY FIX: SMART-WAIT FOR COMPILATION ---
-        # If we are mutating, poll for 'Ready' state for up to 10 seconds before failing.
-        wait_start = time.time()
-        while is_mutation and time.time() - wait_start < 10:
-            status = self._get_vibe_status()
-            if status == "Ready": break
-            if status == "VETOED": 
-                return json.dumps({"error": "VETOED", "message": "Kernel locked by human veto."})
-            time.sleep(1.0) # Wait for compiler/importer
+    def _build_command(self, path, params, capability, cmd_id=None):
+        cmd = {
+            "action": path,
+            "capability": capability,
+            "keys": list(params.keys()) if params else [],
+            "values": [str(v) for v in params.values()] if params else []
+        }
+        if cmd_id: cmd["id"] = cmd_id
+        return cmd
 
-        data = None
-        meta_wrapper = {}
-        # Try HTTP first
-        try:
-            headers = {
-                "X-Vibe-Token": token or "FORCE_WAKE", # Resilience Fix
-                "X-Vibe-Capability": capability,
-                "Content-Type": "application/json"
-            }
-            # The kernel expects requests on /vibe via POST
-            cmd_payload = {
-                "action": path,
-                "capability": capability,
-                "keys": list(params.keys()) if params else [],
-                "values": [str(v) for v in params.values()] if params else []
-            }
-            resp = requests.post(f"http://127.0.0.1:8091/vibe", data=json.dumps(cmd_payload), headers=headers, timeout=5)
-            if resp.status_code == 200:
-                raw_data = resp.json()
-                if isinstance(raw_data, list):
-                    data = {"results": raw_data}
-                elif isinstance(raw_data, dict) and "payload" in raw_data:
-                    meta_wrapper = raw_data
-                    data = json.loads(meta_wrapper.get("payload", "{}"))
-                else:
-                    data = raw_data
-                    if isinstance(raw_data, dict): meta_wrapper = raw_data
-        except Exception as e:
-            # print(f"HTTP Request failed: {e}")
-            pass
-
-        if data is None:
-            raw_wrapper = self._filesystem_request(path, params, capability, is_mutation)
-            if isinstance(raw_wrapper, dict):
-                meta_wrapper = raw_wrapper
-                data = json.loads(meta_wrapper.get("payload", "{}"))
-            elif isinstance(raw_wrapper, list):
-                data = {"results": raw_wrapper}
-            else:
-                data = {"raw": raw_wrapper}
-            
+    def _build_headers(self, token, capability):
+        return {
+            "X-Vibe-Token": token or "FORCE_WAKE", # Resilience Fix
+            "X-Vibe-Capability": capability,
+            "Content-Type": "application/json",
+            # Kernels that support it answer in NDJSON (header line + raw payload); older ones ignore this
+            "Accept": "application/x-ndjson, application/json"
+        }
+
+    def _unwrap_body(self, headers, body):
+        """Decodes an HTTP response body in a single pass when the kernel streamed it as NDJSON."""
+        if is_ndjson(headers): return decode_ndjson(body)
+        return self._unwrap_http(json.loads(body))
+
+    def _unwrap_http(self, raw_data):
+        """Splits an HTTP ResponseWrapper into (data, meta_wrapper)."""
+        if isinstance(raw_data, list):
+            return {"results": raw_data}, {}
+        if isinstance(raw_data, dict) and "payload" in raw_data:
+            return json.loads(raw_data.get("payload", "{}")), raw_data
+        return raw_data, (raw_data if isinstance(raw_data, dict) else {})
+
+    def _unwrap_filesystem(self, raw_wrapper):
+        """Splits an outbox response into (data, meta_wrapper)."""
+        if isinstance(raw_wrapper, dict) and "payload" in raw_wrapper:
+            return json.loads(raw_wrapper.get("payload", "{}")), raw_wrapper
+        if isinstance(raw_wrapper, dict):
+            return raw_wrapper, raw_wrapper
+        if isinstance(raw_wrapper, list):
+            return {"results": raw_wrapper}, {}
+        return {"raw": raw_wrapper}, {}
+
+    def _finalize(self, path, params, is_mutation, data, meta_wrapper):
+        """Applies the type and invariance layers to a kernel response."""
         # --- LAYER 1: TYPE INVARIANT ENFORCEMENT ---
         if not isinstance(data, dict):
             data = {"results": data}
@@ -151,19 +388,18 @@ class UnityAirlock:
         data["_monotonicTick"] = meta_wrapper.get("monotonicTick", 0)
         data["_engineState"] = meta_wrapper.get("state", "UNKNOWN")
 
+        # Log before reporting so the returned wal_hash is the head that includes this mutation
+        if is_mutation:
+            self.logger.log_mutation(path, params, dict(data))
+
         # --- LAYER 2, 8 & 9: CONTEXTUAL & COGNITIVE INVARIANCE ---
-        wal = self.logger.get_wal_tail(1)
         current_tick = data.get("_monotonicTick", 0)
-        
+
         # REALITY FIX: Use a stable hash that ignores volatile timestamps
-        stable_wal_hash = wal[0].get("entryHash", "GENESIS") if wal else "GENESIS"
-        
+        stable_wal_hash = self.logger.head_hash()
+
         # Source health metrics
-        health = {}
-        if os.path.exists(self.health_file):
-            try:
-                with open(self.health_file, "r") as f: health = json.load(f)
-            except: pass
+        health = self.metadata.get_health()
 
         data["_vibe_invariance"] = {
             "wal_hash": stable_wal_hash,
@@ -178,53 +414,34 @@ class UnityAirlock:
             "timestamp": datetime.datetime.utcnow().isoformat()
         }
 
-        if is_mutation: 
-            self.logger.log_mutation(path, params, data)
-        
         return data
 
     def _get_vibe_status(self):
         """Reads the mechanical status of Unity."""
-        if os.path.exists(self.status_file):
-            try:
-                with open(self.status_file, "r") as f:
-                    return json.load(f).get("state", "Unknown")
-            except: pass
-        return "Offline"
+        return self.metadata.get_state()
 
     def _get_token(self):
-        if os.path.exists(self.status_file):
-            try:
-                with open(self.status_file, "r") as f:
-                    return json.load(f).get("nonce")
-            except: pass
-        return None
+        return self.metadata.get_nonce()
 
     def _filesystem_request(self, path, params, capability, is_mutation):
         cmd_id = str(uuid.uuid4())
-        payload = {
-            "action": path,
-            "id": cmd_id,
-            "capability": capability,
-            "keys": list(params.keys()) if params else [],
-            "values": [str(v) for v in params.values()] if params else []
-        }
+        payload = self._build_command(path, params, capability, cmd_id)
 
+        # Register before writing so the shared watcher cannot miss a fast response
+        self.outbox_watcher.register(cmd_id)
         with open(os.path.join(self.inbox, f"{cmd_id}.json"), "w") as f:
             json.dump(payload, f)
 
-        outbox_file = os.path.join(self.outbox, f"res_{cmd_id}.json")
-        start = time.time()
-        while time.time() - start < 15:
-            if os.path.exists(outbox_file):
-                with open(outbox_file, "r") as f: res_content = f.read()
-                os.remove(outbox_file)
-                try:
-                    data = json.loads(res_content)
-                except:
-                    data = {"raw_response": res_content}
-                
-                if is_mutation: self.logger.log_mutation(path, params, data)
-                return data
-            time.sleep(0.1)
-        return {"error": "Timeout"}
+        outbox_file = self.outbox_watcher.wait(cmd_id, 15)
+        if not outbox_file:
+            return {"error": "Timeout"}
+        return self._read_outbox_file(outbox_file) # Logged once, by _finalize
+
+    def _read_outbox_file(self, outbox_file):
+        """Consumes a kernel response file from the outbox."""
+        with open(outbox_file, "r") as f: res_content = f.read()
+        os.remove(outbox_file)
+        try:
+            return json.loads(res_content)
+        except:
+            return {"raw_response": res_content}
@@ -0,0 +1,162 @@
+import os
+import json
+import uuid
+import asyncio
+import httpx
+
+class AsyncUnityAirlock:
+    """
+    UnityVibeBridge: Native asyncio front-end for the UnityAirlock.
+    Shares the sync airlock's Sentinel, Security Gate, logger and invariance
+    layers, but keeps many kernel requests in flight on a single event loop.
+    Filesystem fallbacks are matched to their waiter by command ID.
+    """
+    def __init__(self, airlock, max_connections=16):
+        self.airlock = airlock
+        self.max_connections = max_connections
+        self._client = None
+        self._pending = {} # cmd_id -> Future
+        # Mutations stay strictly ordered; reads run concurrently.
+        self._mutation_lock = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _get_client(self):
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            self._client = httpx.AsyncClient(limits=limits, timeout=5)
+        return self._client
+
+    async def request(self, path, params=None, is_mutation=False, intent=None):
+        """Async counterpart of UnityAirlock.request."""
+        if not is_mutation:
+            return await self._tracked(self._request(path, params, False))
+        if self._mutation_lock is None: self._mutation_lock = asyncio.Lock()
+        async with self._mutation_lock:
+            return await self._tracked(self._request(path, params, True))
+
+    async def _tracked(self, coro):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await coro
+        finally:
+            self.in_flight -= 1
+
+    async def _request(self, path, params, is_mutation):
+        airlock = self.airlock
+        # Security Gate may invoke the C# compiler; keep it off the event loop.
+        blocked = await asyncio.to_thread(airlock._preflight, path, params, is_mutation)
+        if blocked: return blocked
+
+        if not is_mutation:
+            cached = airlock.response_cache.get(path, params)
+            if cached: return airlock._finalize(path, params, False, *cached)
+
+        capability = "Admin" if is_mutation else "Read"
+        token = airlock._get_token()
+
+        # --- REALITY FIX: SMART-WAIT FOR COMPILATION ---
+        if is_mutation:
+            status, _ = await asyncio.to_thread(airlock.readiness.wait_until_ready)
+            if status == "VETOED":
+                return json.dumps({"error": "VETOED", "message": "Kernel locked by human veto."})
+
+        async def fetch():
+            data, meta_wrapper = await self._send(path, params, capability, token, is_mutation)
+            airlock._remember(path, params, is_mutation, data, meta_wrapper)
+            return data, meta_wrapper
+
+        if is_mutation or not airlock.response_cache.is_cacheable(path):
+            data, meta_wrapper = await fetch()
+        else:
+            data, meta_wrapper = await airlock.single_flight.ado(airlock.response_cache.key(path, params), fetch)
+        return airlock._finalize(path, params, is_mutation, data, meta_wrapper)
+
+    async def request_many(self, commands, is_mutation=False, batch_size=50):
+        """Async counterpart of UnityAirlock.request_many; batches are sent concurrently for reads."""
+        airlock = self.airlock
+        capability = "Admin" if is_mutation else "Read"
+        tools = [airlock._build_command(path, params, capability) for path, params in commands]
+        if is_mutation:
+            blocked = await asyncio.to_thread(airlock._preflight_recipe, tools)
+            if blocked: return [json.loads(blocked) for _ in tools]
+            status, _ = await asyncio.to_thread(airlock.readiness.wait_until_ready)
+            if status == "VETOED":
+                return [{"error": "VETOED", "message": "Kernel locked by human veto."} for _ in tools]
+
+        async def send_chunk(chunk):
+            envelope = {"recipe": json.dumps(chunk)}
+            data, meta_wrapper = await self._send("system/execute-recipe", envelope, capability, airlock._get_token(), is_mutation)
+            airlock._remember("system/execute-recipe", envelope, is_mutation, data, meta_wrapper)
+            data = airlock._finalize("system/execute-recipe", envelope, is_mutation, data, meta_wrapper)
+            return airlock._split_batch(data, len(chunk))
+
+        chunks = [tools[i:i + batch_size] for i in range(0, len(tools), batch_size)]
+        if is_mutation:
+            if self._mutation_lock is None: self._mutation_lock = asyncio.Lock()
+            async with self._mutation_lock:
+                batches = [await self._tracked(send_chunk(c)) for c in chunks]
+        else:
+            batches = await asyncio.gather(*[self._tracked(send_chunk(c)) for c in chunks])
+        return [item for batch in batches for item in batch]
+
+    async def _send(self, path, params, capability, token, is_mutation):
+        """Delivers one command over HTTP, falling back to the file queue. Returns (data, meta_wrapper)."""
+        airlock = self.airlock
+        manager = airlock.transport_manager
+        if manager.route() == manager.HTTP:
+            try:
+                cmd_payload = airlock._build_command(path, params, capability)
+                resp = await self._get_client().post(f"http://127.0.0.1:{manager.port}/vibe", content=json.dumps(cmd_payload),
+                                                     headers=airlock._build_headers(token, capability))
+                if resp.status_code == 200:
+                    return airlock._unwrap_body(resp.headers, resp.content)
+            except httpx.TransportError:
+                manager.mark_http_failed()
+            except Exception:
+                pass
+
+        raw_wrapper = await self._filesystem_request(path, params, capability, is_mutation)
+        manager.mark_filesystem_result(not airlock._is_timeout(raw_wrapper))
+        return airlock._unwrap_filesystem(raw_wrapper)
+
+    async def _filesystem_request(self, path, params, capability, is_mutation, timeout=15):
+        airlock = self.airlock
+        cmd_id = str(uuid.uuid4())
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def on_response(outbox_file):
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(outbox_file))
+
+        # Responses are matched to this waiter by ID on the airlock's shared outbox watcher
+        airlock.outbox_watcher.register(cmd_id, on_response)
+        self._pending[cmd_id] = future
+        try:
+            with open(os.path.join(airlock.inbox, f"{cmd_id}.json"), "w") as f:
+                json.dump(airlock._build_command(path, params, capability, cmd_id), f)
+            outbox_file = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return {"error": "Timeout"}
+        finally:
+            self._pending.pop(cmd_id, None)
+            airlock.outbox_watcher.unregister(cmd_id)
+
+        try:
+            data = airlock._read_outbox_file(outbox_file)
+        except Exception as e:
+            data = {"error": f"Outbox read failed: {e}"}
+        return data # Logged once, by _finalize
+
+    def get_stats(self):
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "pending_filesystem": len(self._pending)
+        }
+
+    async def aclose(self):
+        if self._client: await self._client.aclose()
+        self._client = None
@@ -0,0 +1,72 @@
+import os
+import json
+import threading
+
+class MetadataCache:
+    """
+    UnityVibeBridge: In-memory view of the kernel's metadata files.
+    vibe_status.json and vibe_health.json are re-read only when their
+    (inode, mtime_ns, size) signature changes, so a request that asks for
+    the nonce, state and health several times costs one stat per lookup
+    and at most one parse per kernel write.
+    """
+    def __init__(self, project_path):
+        self.status_file = os.path.join(project_path, "metadata", "vibe_status.json")
+        self.health_file = os.path.join(project_path, "metadata", "vibe_health.json")
+        self._entries = {} # path -> (signature, parsed)
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "file_reads": 0, "parse_errors": 0}
+
+    def read(self, path):
+        """Returns the parsed JSON object at `path`, or None if it is missing or unreadable."""
+        with self._lock:
+            self.stats["lookups"] += 1
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._entries.pop(path, None)
+                return None
+            signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+            cached = self._entries.get(path)
+            if cached and cached[0] == signature:
+                self.stats["hits"] += 1
+                return cached[1]
+
+            self.stats["file_reads"] += 1
+            try:
+                with open(path, "r") as f: parsed = json.load(f)
+            except (OSError, ValueError):
+                # Kernel may be mid-write; don't cache a torn file
+                self.stats["parse_errors"] += 1
+                return cached[1] if cached else None
+            if not isinstance(parsed, dict): parsed = {}
+            self._entries[path] = (signature, parsed)
+            return parsed
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path: self._entries.pop(path, None)
+            else: self._entries.clear()
+
+    # --- Typed accessors ---
+
+    def get_status(self):
+        return self.read(self.status_file)
+
+    def get_state(self):
+        """Mechanical kernel state ('Ready', 'COMPILING', 'VETOED', ...) or 'Offline'."""
+        status = self.get_status()
+        if status is None: return "Offline"
+        # The kernel's SetStatus writes 'status'; older builds wrote 'state'
+        return status.get("state") or status.get("status") or "Unknown"
+
+    def get_nonce(self):
+        status = self.get_status()
+        return status.get("nonce") if status else None
+
+    def get_health(self):
+        return self.read(self.health_file) or {}
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, cached_files=len(self._entries))
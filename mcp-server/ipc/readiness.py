@@ -0,0 +1,63 @@
+import time
+import threading
+from .watcher import FileChangeNotifier
+
+class ReadinessWaiter:
+    """
+    UnityVibeBridge: Event-driven replacement for the 1 s smart-wait loop.
+    Re-checks the kernel state every time vibe_status.json is rewritten, so a
+    mutation issued just before a compile finishes proceeds within milliseconds
+    of the 'Ready' transition instead of on the next whole second.
+    """
+    TERMINAL_STATES = ("Ready", "VETOED")
+
+    def __init__(self, metadata, deadline=10.0):
+        self.metadata = metadata
+        self.deadline = deadline
+        self.notifier = FileChangeNotifier(metadata.status_file)
+        self._lock = threading.Lock()
+        self.stats = {"waits": 0, "immediate": 0, "timeouts": 0,
+                      "total_wait_ms": 0.0, "max_wait_ms": 0.0, "last_wait_ms": 0.0}
+
+    def wait_until_ready(self, deadline=None):
+        """Blocks until the kernel is Ready or VETOED, or the deadline passes. Returns (state, waited_seconds)."""
+        deadline = self.deadline if deadline is None else deadline
+        start = time.time()
+        while True:
+            # Capture the version BEFORE reading state so a write in between still wakes us
+            version = self.notifier.version
+            state = self.metadata.get_state()
+            remaining = deadline - (time.time() - start)
+            if state in self.TERMINAL_STATES or remaining <= 0: break
+            self.notifier.wait_for_change(version, remaining)
+
+        waited = time.time() - start
+        self._record(state, waited)
+        return state, waited
+
+    def _record(self, state, waited):
+        waited_ms = waited * 1000
+        with self._lock:
+            self.stats["waits"] += 1
+            if waited_ms < 1: self.stats["immediate"] += 1
+            if state not in self.TERMINAL_STATES: self.stats["timeouts"] += 1
+            self.stats["total_wait_ms"] += waited_ms
+            self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], waited_ms)
+            self.stats["last_wait_ms"] = round(waited_ms, 3)
+
+    def get_stats(self):
+        with self._lock:
+            waits = self.stats["waits"] or 1
+            return {
+                "mode": self.notifier.mode,
+                "deadline_s": self.deadline,
+                "waits": self.stats["waits"],
+                "immediate": self.stats["immediate"],
+                "timeouts": self.stats["timeouts"],
+                "avg_wait_ms": round(self.stats["total_wait_ms"] / waits, 3),
+                "max_wait_ms": round(self.stats["max_wait_ms"], 3),
+                "last_wait_ms": self.stats["last_wait_ms"]
+            }
+
+    def close(self):
+        self.notifier.close()
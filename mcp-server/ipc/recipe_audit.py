@@ -0,0 +1,91 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class RecipeAuditor:
+    """
+    UnityVibeBridge: Parallel, deadline-bounded pre-flight audit for recipes.
+    Each sub-tool is audited on its own worker; the first tool that reports a
+    violation cancels the rest (queued work is dropped, running audits stop at
+    their next parameter). A recipe that does not finish auditing within the
+    deadline is blocked, and workers left behind on a hung compile are
+    abandoned to a retired pool so the next recipe gets fresh ones. Single
+    mutations go through the same deadline as a one-tool batch.
+    C# snippets still compile one at a time: every worker shares the single warm
+    Roslyn host (one dotnet process holding the Unity reference set), so the
+    pool overlaps C# with the Python, path and secret checks of the other tools
+    rather than with each other. The deadline covers the wait for the host.
+    """
+    def __init__(self, max_workers=4, deadline=30.0):
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._pool = self._new_pool()
+        self.stats = {"recipes": 0, "mutations": 0, "tools": 0, "blocked": 0, "fail_fast": 0, "timeouts": 0,
+                      "pools_retired": 0, "last_audit_ms": 0.0, "max_audit_ms": 0.0}
+
+    def _new_pool(self):
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="vibe-audit")
+
+    def run(self, tools, audit_tool, kind="recipes"):
+        """
+        Audits `tools` with audit_tool(tool, cancelled) -> [issues] ("recipes" or "mutations" in the stats).
+        Returns the issues of the tools that failed, in recipe order (empty if all passed).
+        """
+        if not tools: return []
+        start = time.time()
+        cancelled = threading.Event()
+        with self._lock: pool = self._pool
+        futures = {pool.submit(audit_tool, tool, cancelled): i for i, tool in enumerate(tools)}
+
+        results, pending = {}, set(futures)
+        timed_out = False
+        while pending:
+            remaining = self.deadline - (time.time() - start)
+            if remaining <= 0:
+                timed_out = True
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for f in done:
+                try: issues = f.result()
+                except Exception as e: issues = [f"Security Violation: Recipe audit crashed ({e})."]
+                if issues: results[futures[f]] = issues
+            if results: break # Fail fast: one blocked tool blocks the whole recipe
+
+        if pending:
+            cancelled.set()
+            for f in pending: f.cancel()
+            if any(f.running() for f in pending): self._retire(pool)
+
+        issues = [i for idx in sorted(results) for i in results[idx]]
+        if timed_out and not issues:
+            issues = [f"Security Violation: Pre-flight audit exceeded its {self.deadline}s deadline."]
+        self._record(kind, len(tools), issues, timed_out, bool(pending) and not timed_out, start)
+        return issues
+
+    def _retire(self, pool):
+        """Hands stuck workers a pool of their own; they exit once their compile returns or times out."""
+        with self._lock:
+            if self._pool is not pool: return
+            self._pool = self._new_pool()
+            self.stats["pools_retired"] += 1
+        pool.shutdown(wait=False)
+
+    def _record(self, kind, tools, issues, timed_out, fail_fast, start):
+        elapsed_ms = (time.time() - start) * 1000
+        with self._lock:
+            self.stats[kind] += 1
+            self.stats["tools"] += tools
+            if issues: self.stats["blocked"] += 1
+            if timed_out: self.stats["timeouts"] += 1
+            if fail_fast: self.stats["fail_fast"] += 1
+            self.stats["last_audit_ms"] = round(elapsed_ms, 3)
+            self.stats["max_audit_ms"] = round(max(self.stats["max_audit_ms"], elapsed_ms), 3)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, workers=self.max_workers, deadline_s=self.deadline)
+
+    def close(self):
+        with self._lock: pool = self._pool
+        pool.shutdown(wait=False)
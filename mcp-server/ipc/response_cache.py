@@ -0,0 +1,77 @@
+import copy
+import json
+import time
+import threading
+from collections import OrderedDict
+
+class ResponseCache:
+    """
+    UnityVibeBridge: Bounded LRU read-through cache for read-only kernel actions.
+    Entries are stamped with the kernel 'state' hash from the ResponseWrapper and
+    stay valid while that hash is unchanged (plus a TTL safety net for edits a
+    human makes directly in the Editor). Any airlock mutation flushes it.
+    """
+    CACHEABLE_ACTIONS = {"hierarchy", "inspect", "material/list", "system/list-tools", "audit/avatar"}
+
+    def __init__(self, max_entries=256, ttl=10.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.current_state = None
+        self._entries = OrderedDict() # key -> (state, stored_at, data, meta_wrapper)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "invalidations": 0}
+
+    def is_cacheable(self, path):
+        return path in self.CACHEABLE_ACTIONS
+
+    def key(self, path, params):
+        return (path, json.dumps(params or {}, sort_keys=True, default=str))
+
+    def get(self, path, params):
+        """Returns a private copy of (data, meta_wrapper), or None on miss."""
+        if not self.is_cacheable(path): return None
+        key = self.key(path, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            state, stored_at, data, meta_wrapper = entry
+            if state != self.current_state or time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                self.stats["stale"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return copy.deepcopy(data), dict(meta_wrapper)
+
+    def put(self, path, params, data, meta_wrapper):
+        if not self.is_cacheable(path): return
+        if not isinstance(data, dict) or data.get("error"): return # Never cache failures
+        state = meta_wrapper.get("state")
+        if state is None: return
+        key = self.key(path, params)
+        with self._lock:
+            self._entries[key] = (state, time.time(), copy.deepcopy(data), dict(meta_wrapper))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def observe_state(self, state):
+        """Records the kernel state hash seen on any response; entries from other states go stale."""
+        if state is None: return
+        with self._lock:
+            self.current_state = state
+
+    def invalidate(self):
+        with self._lock:
+            if self._entries: self.stats["invalidations"] += 1
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(self.stats, entries=len(self._entries), max_entries=self.max_entries,
+                        ttl_s=self.ttl, hit_rate=round(self.stats["hits"] / lookups, 3) if lookups else 0.0)
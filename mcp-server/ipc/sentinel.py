@@ -1,98 +1,244 @@
 import hashlib
 import os
 import json
+import time
 import logging
+import threading
+import sys
+from .watcher import TreeWatcher
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from scripts.merkle_tree import MerkleTree
 
 class BinarySentinel:
     """
     UnityVibeBridge: The Outside-In Integrity Watcher.
-    Verifies that the compiled C# assembly matches the authorized release 
+    Verifies that the compiled C# assembly matches the authorized release
     or the current local source code (Dev Mode).
+    Verification runs in the background: file hashes are kept in a manifest
+    keyed by (size, mtime_ns) so only changed files are re-hashed, and the DLL
+    and Scripts folder are watched so `is_verified` follows edits live.
+    Sources are hashed as a Merkle tree on a thread pool; when the integrity map
+    carries the release tree, the report names the files that drifted from it.
     """
+    MANIFEST_FORMAT = 1
+    DEBOUNCE = 0.25 # Unity rewrites many files per compile; verify once per burst
+    RACY_WINDOW_NS = 2 * 10**9 # Files modified this recently are not trusted from the manifest
+
     def __init__(self, project_path, logger):
         self.project_path = project_path
         self.logger = logger
         self.integrity_file = os.path.join(project_path, "metadata", "vibe_integrity.json")
+        self.manifest_file = os.path.join(project_path, "metadata", "vibe_sentinel_manifest.json")
         self.scripts_dir = os.path.join(project_path, "unity-package", "Scripts")
         self.is_verified = False
         self.verification_mode = "None"
         self.last_error = None
+        self.drift = None # {"added", "removed", "modified"} against the integrity map's source tree
+        self.state = "Unknown" # Unknown -> Verified | Failed; back to Unknown while a change is re-checked
+
+        self._manifest = None
+        self._manifest_dirty = False
+        self._verify_lock = threading.Lock()
+        self._hash_lock = threading.Lock() # Manifest and stats are shared by the hashing workers
+        self.merkle = MerkleTree(hash_file=self._calculate_file_hash)
+        self._cond = threading.Condition()
+        self._generation = 0 # Bumped by every observed change
+        self._changed = threading.Event()
+        self._closed = False
+        self._thread = None
+        self._watcher = None
+        self.stats = {"verifications": 0, "files_hashed": 0, "files_reused": 0, "changes": 0,
+                      "waits": 0, "last_verify_ms": 0.0}
+
+    # --- BACKGROUND ---
+
+    def start(self, watch=True):
+        """Verifies in the background and (optionally) keeps watching for changes."""
+        if self._thread and self._thread.is_alive(): return
+        self._closed = False
+        if watch:
+            self._watcher = TreeWatcher([self.scripts_dir, self._dll_path()], self._on_change)
+            self._watcher.start()
+        self._thread = threading.Thread(target=self._run, name="VibeSentinel", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._changed.clear()
+            with self._cond: generation = self._generation
+            self._verify(generation)
+            self._changed.wait()
+            if self._closed: break
+            time.sleep(self.DEBOUNCE)
+
+    def _on_change(self):
+        with self._cond:
+            self._generation += 1
+            self.state = "Unknown"
+            self.stats["changes"] += 1
+        self._changed.set()
+
+    def wait_until_known(self, timeout=10.0):
+        """Returns is_verified, blocking only while the state is Unknown (startup or a pending re-check)."""
+        with self._cond:
+            unknown = self.state == "Unknown"
+            running = self._thread is not None and self._thread.is_alive()
+            if unknown:
+                self.stats["waits"] += 1
+                if running: self._cond.wait_for(lambda: self.state != "Unknown" or self._closed, timeout)
+        if unknown and not running: self.verify() # Never started (or closed): check inline
+        with self._cond:
+            return self.state == "Verified" and self.is_verified
+
+    def close(self):
+        self._closed = True
+        self._changed.set()
+        with self._cond: self._cond.notify_all()
+        if self._watcher: self._watcher.close()
+        if self._thread: self._thread.join(timeout=1.0)
+
+    # --- VERIFICATION ---
 
     def verify(self):
-        """Mandatory pre-flight check for the UnityAirlock."""
+        """Mandatory pre-flight check for the UnityAirlock (synchronous)."""
+        with self._cond: generation = self._generation
+        return self._verify(generation)
+
+    def _verify(self, generation):
+        start = time.time()
+        with self._verify_lock:
+            verified, mode, error, drift = self._check()
+            self._save_manifest()
+        with self._cond:
+            self.stats["verifications"] += 1
+            self.stats["last_verify_ms"] = round((time.time() - start) * 1000, 3)
+            # A change that landed mid-check makes this result stale: stay Unknown for the next pass
+            if generation == self._generation:
+                self.is_verified, self.verification_mode, self.last_error = verified, mode, error
+                self.drift = drift
+                self.state = "Verified" if verified else "Failed"
+            self._cond.notify_all()
+        return verified
+
+    def _check(self):
+        """Returns (verified, mode, error, drift)."""
+        drift = None
         try:
             if not os.path.exists(self.integrity_file):
-                self.is_verified = self._run_dev_verification()
-                self.verification_mode = "LocalDev"
-                return self.is_verified
+                return self._run_dev_verification(), "LocalDev", None, None
 
             with open(self.integrity_file, "r") as f:
                 map_data = json.load(f)
 
+            # Source drift is reported, not enforced: the DLL is what actually runs
+            current_tree = None
+            if map_data.get("source_tree"):
+                current_tree = self.merkle.build(self.scripts_dir)
+                drift = MerkleTree.diff(map_data["source_tree"], current_tree)
+
             # 1. Identity Check: Does the DLL on disk match the manifest?
-            dll_path = map_data.get("path")
-            if not dll_path or not os.path.exists(dll_path):
-                # Try fallback locations
-                dll_path = self._find_dll_fallback()
-            
+            dll_path = self._dll_path(map_data)
             if not dll_path:
-                self.last_error = "Binary not found on disk."
-                return False
+                return False, self.verification_mode, "Binary not found on disk.", drift
 
             actual_binary_hash = self._calculate_file_hash(dll_path)
             if actual_binary_hash == map_data.get("binary_hash"):
-                self.is_verified = True
-                self.verification_mode = "OfficialRelease"
-                return True
+                return True, "OfficialRelease", None, drift
 
             # 2. Mirror Test: If it's not an official release, does it match local source?
             # This allows frictionless development.
-            current_source_hash = self._calculate_folder_hash(self.scripts_dir)
+            current_source_hash = current_tree["root"] if current_tree else self._calculate_folder_hash(self.scripts_dir)
             if actual_binary_hash == self._predict_dll_hash(current_source_hash):
-                self.is_verified = True
-                self.verification_mode = "LocalDev (Mirror Match)"
-                return True
+                return True, "LocalDev (Mirror Match)", None, drift
 
-            self.last_error = f"Binary Tampering Detected. Hash mismatch: {actual_binary_hash}"
-            self.is_verified = False
-            return False
+            error = f"Binary Tampering Detected. Hash mismatch: {actual_binary_hash}"
+            changed = sum(len(v) for v in drift.values()) if drift else 0
+            if changed: error += f" ({changed} source file(s) drifted from the integrity map)"
+            return False, self.verification_mode, error, drift
 
         except Exception as e:
-            self.last_error = f"Sentinel Failure: {str(e)}"
-            return False
+            return False, self.verification_mode, f"Sentinel Failure: {str(e)}", drift
+
+    def _dll_path(self, map_data=None):
+        if map_data is None:
+            try:
+                with open(self.integrity_file, "r") as f: map_data = json.load(f)
+            except (OSError, ValueError):
+                map_data = {}
+        dll_path = map_data.get("path")
+        if not dll_path or not os.path.exists(dll_path):
+            # Try fallback locations
+            dll_path = self._find_dll_fallback()
+        return dll_path
 
     def get_status_report(self):
         return {
             "verified": self.is_verified,
+            "state": self.state,
             "mode": self.verification_mode,
-            "error": self.last_error
+            "error": self.last_error,
+            "drift": self.drift
         }
 
+    def get_stats(self):
+        with self._cond:
+            return dict(self.stats, state=self.state, watcher=self._watcher.mode if self._watcher else None)
+
+    # --- MANIFEST ---
+
+    def _load_manifest(self):
+        if self._manifest is None:
+            self._manifest = {}
+            try:
+                with open(self.manifest_file, "r") as f: data = json.load(f)
+                if data.get("format") == self.MANIFEST_FORMAT: self._manifest = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+        return self._manifest
+
+    def _save_manifest(self):
+        if not self._manifest_dirty: return
+        try:
+            os.makedirs(os.path.dirname(self.manifest_file), exist_ok=True)
+            tmp = f"{self.manifest_file}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f: json.dump({"format": self.MANIFEST_FORMAT, "files": self._manifest}, f)
+            os.replace(tmp, self.manifest_file)
+            self._manifest_dirty = False
+        except OSError:
+            pass
+
     def _calculate_file_hash(self, filepath):
+        """sha256 of a file, reused from the manifest while its size and mtime are unchanged."""
+        st = os.stat(filepath)
+        with self._hash_lock:
+            entry = self._load_manifest().get(filepath)
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                self.stats["files_reused"] += 1
+                return entry["sha256"]
+
         sha256 = hashlib.sha256()
         with open(filepath, 'rb') as f:
             while True:
                 data = f.read(65536)
                 if not data: break
                 sha256.update(data)
-        return sha256.hexdigest()
+        digest = sha256.hexdigest()
+        with self._hash_lock:
+            self.stats["files_hashed"] += 1
+            # A write in the same mtime tick as this read would go unnoticed; only remember settled files
+            if time.time_ns() - st.st_mtime_ns > self.RACY_WINDOW_NS:
+                self._manifest[filepath] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+                self._manifest_dirty = True
+        return digest
 
     def _calculate_folder_hash(self, directory):
-        sha256 = hashlib.sha256()
-        for root, dirs, files in os.walk(directory):
-            for names in sorted(files):
-                if names.endswith(".cs"):
-                    filepath = os.path.join(root, names)
-                    with open(filepath, 'rb') as f:
-                        while True:
-                            data = f.read(65536)
-                            if not data: break
-                            sha256.update(data)
-        return sha256.hexdigest()
+        """Merkle root of the .cs sources (see scripts/merkle_tree.py)."""
+        return self.merkle.build(directory)["root"]
 
     def _predict_dll_hash(self, source_hash):
         """
-        Heuristic: In a deterministic build, the DLL hash is a derivative 
+        Heuristic: In a deterministic build, the DLL hash is a derivative
         of the source hash. For now, we allow the local build if source matches.
         """
         # In a full implementation, this would involve a local 'csc' dry-run.
@@ -102,7 +248,7 @@ class BinarySentinel:
         """Fallback for when no manifest exists (fresh clone)."""
         # Scan source for hard bans via SecurityGate
         # (This is already done in airlock.py, but Sentinel adds DLL identity)
-        return True 
+        return True
 
     def _find_dll_fallback(self):
         candidates = [
@@ -0,0 +1,85 @@
+import copy
+import asyncio
+import threading
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    UnityVibeBridge: Collapses identical in-flight reads into one kernel round trip.
+    The first caller for a key (the leader) does the work; callers arriving while
+    it is in flight wait for it and get their own copy of the result, so N agents
+    asking for the same hierarchy cost the kernel's main thread one command.
+    """
+    def __init__(self):
+        self._calls = {}  # key -> _Call (threads)
+        self._futures = {} # key -> asyncio.Future (event loop)
+        self._lock = threading.Lock()
+        self.stats = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key, fn):
+        """Runs fn() once per concurrent key; every caller receives a private deep copy."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                with self._lock: self.stats["errors"] += 1
+            finally:
+                with self._lock: self._calls.pop(key, None)
+                call.event.set()
+        else:
+            call.event.wait()
+
+        if call.error: raise call.error
+        return copy.deepcopy(call.result)
+
+    async def ado(self, key, coro_fn):
+        """Async counterpart of do(); coro_fn() is awaited once per concurrent key."""
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = self._futures[key] = asyncio.get_running_loop().create_future()
+                self.stats["leaders"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if leader:
+            try:
+                result = await coro_fn()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception() # Mark retrieved even if nobody else was waiting
+                with self._lock: self.stats["errors"] += 1
+                raise
+            else:
+                future.set_result(result)
+            finally:
+                with self._lock: self._futures.pop(key, None)
+            return copy.deepcopy(result)
+
+        # shield() so a cancelled follower doesn't cancel the shared result
+        return copy.deepcopy(await asyncio.shield(future))
+
+    def get_stats(self):
+        with self._lock:
+            total = self.stats["leaders"] + self.stats["coalesced"]
+            return dict(self.stats, in_flight=len(self._calls) + len(self._futures),
+                        coalesce_rate=round(self.stats["coalesced"] / total, 3) if total else 0.0)
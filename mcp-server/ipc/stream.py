@@ -0,0 +1,100 @@
+import json
+import codecs
+
+NDJSON = "application/x-ndjson"
+
+def is_ndjson(headers):
+    return NDJSON in (headers.get("Content-Type") or "")
+
+def decode_ndjson(body):
+    """
+    Decodes a complete NDJSON kernel response: a header line (tick/state/budget),
+    then the payload verbatim. Unlike the ResponseWrapper the payload is not a
+    JSON string inside JSON, so it is parsed exactly once. Returns (data, meta_wrapper).
+    """
+    head, _, rest = body.partition(b"\n")
+    meta = json.loads(head)
+    data = json.loads(rest) if rest.strip() else {}
+    return data, meta
+
+class StreamedPayload:
+    """
+    UnityVibeBridge: Incremental reader for one NDJSON kernel response.
+    Iterating yields the elements of the payload's `key` array (e.g. hierarchy
+    'objects') as their bytes arrive, keeping only the unread tail in memory.
+    `meta` holds the header line; if the payload has no such array (an error
+    response), it is parsed whole into `data` and nothing is yielded.
+    """
+    _WS = " \t\r\n"
+
+    def __init__(self, chunks, key="objects"):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._marker = '"%s":' % key
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.meta = {}
+        self.data = None
+        self.items = 0
+
+    def _more(self):
+        """Appends the next chunk to the buffer; False once the stream is exhausted."""
+        if self._eof: return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buf += self._utf8.decode(b"", final=True)
+            return False
+        # Drop consumed text so a 10k-object page never sits in memory whole
+        if self._pos > 65536:
+            self._buf, self._pos = self._buf[self._pos:], 0
+        self._buf += self._utf8.decode(chunk)
+        return True
+
+    def _skip(self, chars):
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in chars: self._pos += 1
+            if self._pos < len(self._buf) or not self._more(): return
+
+    def __iter__(self):
+        # Header line
+        while "\n" not in self._buf:
+            if not self._more(): raise ValueError("Truncated stream: missing header line.")
+        newline = self._buf.index("\n")
+        self.meta = json.loads(self._buf[:newline])
+        self._pos = newline + 1
+
+        # Seek to the item array; unescaped quotes can't occur inside JSON strings, so the marker is unambiguous
+        while True:
+            found = self._buf.find(self._marker, self._pos)
+            if found != -1: break
+            if not self._more():
+                payload = self._buf[self._pos:].strip()
+                self.data = json.loads(payload) if payload else {}
+                return
+        self._pos = found + len(self._marker)
+        self._skip(self._WS)
+        if self._buf[self._pos:self._pos + 1] != "[":
+            raise ValueError(f"Expected an array after {self._marker}")
+        self._pos += 1
+
+        decoder = json.JSONDecoder()
+        while True:
+            self._skip(self._WS + ",")
+            if self._pos >= len(self._buf): raise ValueError("Truncated stream: unterminated array.")
+            if self._buf[self._pos] == "]": return
+            try:
+                item, end = decoder.raw_decode(self._buf, self._pos)
+                # A value is only complete once its delimiter is in view ('12' may be '123', '6.5' may be '6.5e3')
+                follow = end
+                while follow < len(self._buf) and self._buf[follow] in self._WS: follow += 1
+                if follow == len(self._buf) or self._buf[follow] not in ",]":
+                    if self._more(): continue
+                    raise ValueError("Truncated stream: unterminated array.")
+            except ValueError:
+                if self._more(): continue
+                raise
+            self._pos = end
+            self.items += 1
+            yield item
@@ -0,0 +1,190 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+class KernelTransport:
+    """
+    UnityVibeBridge: Long-lived HTTP transport for the kernel's /vibe listener.
+    Keeps a pool of keep-alive connections per kernel port so that small
+    inspect/list/set-value calls stop paying TCP setup on every round trip.
+    """
+    def __init__(self, host="127.0.0.1", pool_connections=4, pool_maxsize=8):
+        self.host = host
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._session_lock = threading.Lock() # Guards swapping the session in reset()
+        self._local = threading.local() # .reused: the calling thread's last request got a pooled socket
+        self._counters = {} # port -> {requests, probes, connections_created, connections_reused}
+        self.reconnects = 0
+        self.session = self._open_session()
+
+    def _open_session(self):
+        transport = self
+
+        class _CountingConnection(HTTPConnection):
+            def connect(self):
+                super().connect()
+                transport._count(self.port, "connections_created")
+
+        class _CountingPool(HTTPConnectionPool):
+            ConnectionCls = _CountingConnection
+
+            def _get_conn(self, timeout=None):
+                conn = super()._get_conn(timeout)
+                transport._local.reused = conn.sock is not None # Dropped sockets were closed above
+                return conn
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize, max_retries=0)
+        adapter.poolmanager.pool_classes_by_scheme = dict(
+            adapter.poolmanager.pool_classes_by_scheme, http=_CountingPool)
+        session.mount("http://", adapter)
+        return session
+
+    def _count(self, port, key):
+        with self._lock:
+            entry = self._counters.setdefault(port, {"requests": 0, "probes": 0, "connections_created": 0,
+                                                     "connections_reused": 0})
+            entry[key] += 1
+
+    def _send(self, session, method, port, url, **kwargs):
+        self._local.reused = False
+        resp = session.request(method, url, **kwargs)
+        if self._local.reused: self._count(port, "connections_reused")
+        return resp
+
+    def post(self, port, path, body, headers, timeout=5, stream=False, idempotent=False):
+        """
+        POSTs to the kernel. An idempotent call whose reused pooled socket turned out
+        stale is retried once on a fresh pool; a mutation never is, since the kernel
+        may have applied it before the connection dropped.
+        """
+        url = f"http://{self.host}:{port}/{path.lstrip('/')}"
+        self._count(port, "requests")
+        session = self.session
+        try:
+            return self._send(session, "POST", port, url, data=body, headers=headers, timeout=timeout, stream=stream)
+        except requests.ConnectionError:
+            # Kernel restarted (domain reload, editor relaunch) and a pooled
+            # socket died mid-request. Drop the pool and retry on a fresh one.
+            if not (idempotent and self._local.reused):
+                raise
+            session = self.reset(session)
+            return self._send(session, "POST", port, url, data=body, headers=headers, timeout=timeout, stream=stream)
+
+    def get(self, port, path, timeout=5):
+        """Liveness probes; counted apart from kernel requests."""
+        url = f"http://{self.host}:{port}/{path.lstrip('/')}"
+        self._count(port, "probes")
+        return self.session.get(url, timeout=timeout)
+
+    def reset(self, stale=None):
+        """Drops all pooled connections. Returns the session to use (`stale` is only replaced once)."""
+        with self._session_lock:
+            if stale is not None and self.session is not stale: return self.session # Another thread already did
+            old, self.session = self.session, self._open_session()
+            with self._lock:
+                self.reconnects += 1
+        try: old.close() # In-flight requests on it finish; their sockets are discarded on release
+        except: pass
+        return self.session
+
+    def close(self):
+        try: self.session.close()
+        except: pass
+
+    def get_stats(self):
+        """Reports connection reuse per kernel port."""
+        with self._lock:
+            ports = {}
+            for port, c in self._counters.items():
+                ports[str(port)] = dict(c)
+            return {
+                "pool_connections": self.pool_connections,
+                "pool_maxsize": self.pool_maxsize,
+                "reconnects": self.reconnects,
+                "ports": ports
+            }
+
+class TransportManager:
+    """
+    UnityVibeBridge: Remembers which kernel transport is healthy.
+    Requests go straight to the healthy path; once the HTTP listener fails,
+    calls route to the file queue and a background probe polls /health with
+    backoff until the listener is back, so the HTTP timeout is paid once.
+    """
+    HTTP = "http"
+    FILESYSTEM = "filesystem"
+
+    def __init__(self, transport, settings=None, probe_interval=1.0, max_probe_interval=10.0, probe_timeout=0.5):
+        settings = settings or {}
+        self.transport = transport
+        self.port = settings.get("ports", {}).get("control", 8085)
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.probe_timeout = probe_timeout
+        self.http_healthy = True
+        self.filesystem_healthy = True
+        self._lock = threading.Lock()
+        self._probe_thread = None
+        self._closed = threading.Event()
+        self.stats = {"routed_http": 0, "routed_filesystem": 0, "http_failures": 0,
+                      "filesystem_timeouts": 0, "failovers": 0, "recoveries": 0, "probes": 0}
+
+    def route(self):
+        """Returns the transport the next request should use."""
+        with self._lock:
+            choice = self.HTTP if self.http_healthy else self.FILESYSTEM
+            self.stats["routed_" + choice] += 1
+            return choice
+
+    def mark_http_failed(self):
+        with self._lock:
+            self.stats["http_failures"] += 1
+            if not self.http_healthy: return
+            self.http_healthy = False
+            self.stats["failovers"] += 1
+        self._start_probe()
+
+    def mark_filesystem_result(self, ok):
+        with self._lock:
+            self.filesystem_healthy = ok
+            if not ok: self.stats["filesystem_timeouts"] += 1
+
+    def _start_probe(self):
+        with self._lock:
+            if self._probe_thread and self._probe_thread.is_alive(): return
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="VibeTransportProbe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        interval = self.probe_interval
+        while not self._closed.wait(interval):
+            with self._lock: self.stats["probes"] += 1
+            if self.probe():
+                with self._lock:
+                    self.http_healthy = True
+                    self.stats["recoveries"] += 1
+                return
+            interval = min(interval * 2, self.max_probe_interval)
+
+    def probe(self):
+        """One cheap liveness check against the kernel's /health endpoint."""
+        try:
+            resp = self.transport.get(self.port, "health", timeout=self.probe_timeout)
+            return resp.status_code == 200
+        except Exception:
+            return False
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, port=self.port,
+                        active=self.HTTP if self.http_healthy else self.FILESYSTEM,
+                        http_healthy=self.http_healthy, filesystem_healthy=self.filesystem_healthy)
+
+    def close(self):
+        self._closed.set()
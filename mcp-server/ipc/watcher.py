@@ -0,0 +1,383 @@
+import os
+import math
+import time
+import struct
+import select
+import ctypes
+import ctypes.util
+import threading
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify. Raises OSError where unavailable."""
+    def __init__(self):
+        if not hasattr(os, "O_NONBLOCK") or not os.path.exists("/proc/sys/fs/inotify"):
+            raise OSError("inotify not supported on this platform")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def read_events(self, timeout):
+        """Yields (wd, mask, name) tuples, waiting up to `timeout` seconds for the first one."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready: return
+        try:
+            buf = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            yield wd, mask, name
+
+    def close(self):
+        try: os.close(self.fd)
+        except OSError: pass
+
+class _Waiter:
+    __slots__ = ("event", "callback", "registered_at", "path")
+
+    def __init__(self, callback):
+        self.event = threading.Event()
+        self.callback = callback
+        self.registered_at = time.time()
+        self.path = None
+
+class OutboxWatcher:
+    """
+    UnityVibeBridge: Shared outbox watcher for filesystem-queue responses.
+    One background thread serves every pending request: inotify wakes the exact
+    waiter when 'res_<id>.json' is closed for writing. Without inotify it falls
+    back to a single adaptive poll (5 ms growing to 100 ms while idle).
+    """
+    LEGACY_POLL_INTERVAL = 0.1
+    MIN_POLL_INTERVAL = 0.005
+
+    def __init__(self, directory, use_inotify=True):
+        self.directory = directory
+        self.use_inotify = use_inotify
+        self.mode = "idle"
+        self._waiters = {} # cmd_id -> _Waiter
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._inotify = None
+        self._closed = False
+        self.stats = {"waits": 0, "delivered": 0, "timeouts": 0,
+                      "total_latency_ms": 0.0, "total_saved_ms": 0.0, "last_saved_ms": 0.0}
+
+    def register(self, cmd_id, callback=None):
+        """Must be called BEFORE the inbox file is written so no response can be missed."""
+        waiter = _Waiter(callback)
+        with self._lock:
+            self._waiters[cmd_id] = waiter
+            self.stats["waits"] += 1
+        self._ensure_thread()
+        self._wakeup.set()
+        return waiter
+
+    def unregister(self, cmd_id):
+        with self._lock:
+            self._waiters.pop(cmd_id, None)
+
+    def wait(self, cmd_id, timeout):
+        """Blocks until the response for cmd_id lands. Returns its path, or None on timeout."""
+        with self._lock:
+            waiter = self._waiters.get(cmd_id)
+        if waiter is None: return None
+        try:
+            if waiter.event.wait(timeout): return waiter.path
+            with self._lock: self.stats["timeouts"] += 1
+            return None
+        finally:
+            self.unregister(cmd_id)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive(): return
+            self._closed = False
+            if self.use_inotify and self._inotify is None:
+                try:
+                    self._inotify = Inotify()
+                    self._inotify.add_watch(self.directory, IN_CLOSE_WRITE | IN_MOVED_TO)
+                    self.mode = "inotify"
+                except (OSError, AttributeError):
+                    if self._inotify: self._inotify.close()
+                    self._inotify = None
+            if self._inotify is None: self.mode = "polling"
+            self._thread = threading.Thread(target=self._run, name="VibeOutboxWatcher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        interval = self.MIN_POLL_INTERVAL
+        while not self._closed:
+            # A registration may race with a response already on disk: always sweep once.
+            if self._wakeup.is_set():
+                self._wakeup.clear()
+                interval = self.MIN_POLL_INTERVAL
+                self._sweep()
+
+            if self._inotify:
+                for _wd, _mask, name in self._inotify.read_events(0.5):
+                    self._deliver_name(name)
+                continue
+
+            if self._sweep(): interval = self.MIN_POLL_INTERVAL
+            else: interval = min(interval * 1.5, self.LEGACY_POLL_INTERVAL)
+            self._wakeup.wait(interval)
+
+    def _sweep(self):
+        with self._lock:
+            if not self._waiters: return False
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return False
+        return sum(self._deliver_name(n) for n in names) > 0
+
+    def _deliver_name(self, name):
+        if not (name.startswith("res_") and name.endswith(".json")): return False
+        cmd_id = name[4:-5]
+        with self._lock:
+            waiter = self._waiters.get(cmd_id)
+            if waiter is None or waiter.event.is_set(): return False
+            waiter.path = os.path.join(self.directory, name)
+            latency = time.time() - waiter.registered_at
+            # The legacy loop checked at t = 0, 0.1, 0.2 ... so it saw the file at the next 100 ms boundary.
+            legacy = math.ceil(latency / self.LEGACY_POLL_INTERVAL) * self.LEGACY_POLL_INTERVAL
+            saved_ms = max(0.0, legacy - latency) * 1000
+            self.stats["delivered"] += 1
+            self.stats["total_latency_ms"] += latency * 1000
+            self.stats["total_saved_ms"] += saved_ms
+            self.stats["last_saved_ms"] = round(saved_ms, 3)
+            waiter.event.set()
+        if waiter.callback:
+            try: waiter.callback(waiter.path)
+            except Exception: pass
+        return True
+
+    def get_stats(self):
+        with self._lock:
+            delivered = self.stats["delivered"] or 1
+            return {
+                "mode": self.mode,
+                "pending": len(self._waiters),
+                "waits": self.stats["waits"],
+                "delivered": self.stats["delivered"],
+                "timeouts": self.stats["timeouts"],
+                "avg_latency_ms": round(self.stats["total_latency_ms"] / delivered, 3),
+                "avg_saved_ms": round(self.stats["total_saved_ms"] / delivered, 3),
+                "total_saved_ms": round(self.stats["total_saved_ms"], 3),
+                "last_saved_ms": self.stats["last_saved_ms"]
+            }
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        if self._thread: self._thread.join(timeout=1.0)
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+class FileChangeNotifier:
+    """
+    Wakes waiters whenever a single watched file is rewritten (e.g. vibe_status.json).
+    Uses inotify on the parent directory; otherwise polls the file's signature with
+    a fine-grained backoff, but only while someone is actually waiting.
+    """
+    MIN_POLL_INTERVAL = 0.002
+    MAX_POLL_INTERVAL = 0.05
+
+    def __init__(self, path, use_inotify=True):
+        self.path = path
+        self.directory = os.path.dirname(path)
+        self.filename = os.path.basename(path)
+        self.use_inotify = use_inotify
+        self.mode = "idle"
+        self.version = 0
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._thread = None
+        self._inotify = None
+        self._closed = False
+
+    def wait_for_change(self, version, timeout):
+        """Blocks until the file changes after `version` was observed. Returns True on change."""
+        self._ensure_thread()
+        with self._cond:
+            self._waiting += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: self.version != version or self._closed, timeout)
+            finally:
+                self._waiting -= 1
+            return self.version != version
+
+    def _ensure_thread(self):
+        with self._cond:
+            if self._thread and self._thread.is_alive(): return
+            self._closed = False
+            if self.use_inotify and self._inotify is None:
+                try:
+                    self._inotify = Inotify()
+                    self._inotify.add_watch(self.directory, IN_CLOSE_WRITE | IN_MOVED_TO)
+                    self.mode = "inotify"
+                except (OSError, AttributeError):
+                    if self._inotify: self._inotify.close()
+                    self._inotify = None
+            if self._inotify is None: self.mode = "polling"
+            self._thread = threading.Thread(target=self._run, name="VibeFileNotifier", daemon=True)
+            self._thread.start()
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _bump(self):
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def _run(self):
+        if self._inotify:
+            while not self._closed:
+                if any(name == self.filename for _wd, _mask, name in self._inotify.read_events(0.5)):
+                    self._bump()
+            return
+
+        interval = self.MIN_POLL_INTERVAL
+        last = self._signature()
+        while not self._closed:
+            with self._cond:
+                if not self._waiting:
+                    # Nobody is waiting: sleep until a waiter arrives instead of polling
+                    # Keep `last` from before the nap: a change made meanwhile must still wake the waiter.
+                    self._cond.wait_for(lambda: self._waiting or self._closed)
+                    interval = self.MIN_POLL_INTERVAL
+                    continue
+            current = self._signature()
+            if current != last:
+                last = current
+                interval = self.MIN_POLL_INTERVAL
+                self._bump()
+            else:
+                interval = min(interval * 1.5, self.MAX_POLL_INTERVAL)
+            time.sleep(interval)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread: self._thread.join(timeout=1.0)
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+class TreeWatcher:
+    """
+    Calls `callback()` whenever a file under the watched roots is written, created,
+    moved or deleted. Uses inotify (one watch per directory, new subdirectories
+    are picked up as they appear); otherwise compares a stat-only signature of
+    the trees every `poll_interval` seconds. Roots may be files or directories.
+    """
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, roots, callback, use_inotify=True, poll_interval=2.0):
+        self.roots = [r for r in roots if r]
+        self.callback = callback
+        self.use_inotify = use_inotify
+        self.poll_interval = poll_interval
+        self.mode = "idle"
+        self.events = 0
+        self._dirs = {} # inotify wd -> directory
+        self._inotify = None
+        self._thread = None
+        self._closed = threading.Event()
+
+    def start(self):
+        if self._thread and self._thread.is_alive(): return
+        if self.use_inotify:
+            try:
+                self._inotify = Inotify()
+                for root in self.roots:
+                    if os.path.isdir(root): self._watch_tree(root)
+                    else: self._watch_dir(os.path.dirname(root))
+                self.mode = "inotify"
+            except (OSError, AttributeError):
+                if self._inotify: self._inotify.close()
+                self._inotify, self._dirs = None, {}
+        if self._inotify is None: self.mode = "polling"
+        self._thread = threading.Thread(target=self._run, name="VibeTreeWatcher", daemon=True)
+        self._thread.start()
+
+    def _watch_dir(self, directory):
+        try: self._dirs[self._inotify.add_watch(directory, self.MASK)] = directory
+        except OSError: pass # Missing directories are simply not watched
+
+    def _watch_tree(self, directory):
+        for current, _dirs, _files in os.walk(directory): self._watch_dir(current)
+
+    def _signature(self):
+        sig = []
+        for root in self.roots:
+            if os.path.isfile(root):
+                paths = [root]
+            else:
+                paths = [os.path.join(cur, f) for cur, _d, files in os.walk(root) for f in files]
+            for path in sorted(paths):
+                try:
+                    st = os.stat(path)
+                    sig.append((path, st.st_mtime_ns, st.st_size))
+                except OSError: pass
+        return sig
+
+    def _run(self):
+        if self._inotify:
+            while not self._closed.is_set():
+                changed = False
+                for wd, mask, name in self._inotify.read_events(0.5):
+                    changed = True
+                    if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and wd in self._dirs:
+                        self._watch_tree(os.path.join(self._dirs[wd], name))
+                if changed: self._fire()
+            return
+
+        last = self._signature()
+        while not self._closed.wait(self.poll_interval):
+            current = self._signature()
+            if current != last:
+                last = current
+                self._fire()
+
+    def _fire(self):
+        self.events += 1
+        try: self.callback()
+        except Exception: pass
+
+    def close(self):
+        self._closed.set()
+        if self._thread: self._thread.join(timeout=1.0)
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
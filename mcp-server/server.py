@@ -4,7 +4,7 @@ import os
 
 def check_dependencies():
     """Verifies all required packages for VibeBridge Hardening are present."""
-    required = ["mcp", "requests", "psutil"]
+    required = ["mcp", "requests", "httpx", "psutil"]
     missing = []
     for pkg in required:
         try:
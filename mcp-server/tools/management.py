@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import requests
 
 def register_management_tools(engine):
@@ -39,17 +40,17 @@ def register_management_tools(engine):
         return "\n".join(report)
 
     @mcp.tool()
-    def mutate_script(path: str, code: str) -> str:
+    async def mutate_script(path: str, code: str) -> str:
         """
         [HARDENED] Writes a C# or Python script to the project after performing a mandatory security audit.
         Triggers AssetDatabase.Refresh() automatically on success for Unity assets.
         """
         from scripts.security_gate import SecurityGate
         
-        # 1. Mandatory Pre-Flight Security Audit
+        # 1. Mandatory Pre-Flight Security Audit (off the event loop: may run the compiler)
         errors = []
         if path.endswith(".cs"):
-            errors = SecurityGate.check_csharp(code)
+            errors = await asyncio.to_thread(SecurityGate.check_csharp, code)
         elif path.endswith(".py"):
             errors = SecurityGate.check_python(code)
         
@@ -70,7 +71,7 @@ def register_management_tools(engine):
             
         # 3. Automated Gated Refresh
         if path.endswith(".cs") or path.endswith(".meta"):
-            engine.unity_request("system/refresh")
+            await engine.async_unity_request("system/refresh")
             
         return f"Script written successfully to {path}. Unity refresh triggered if applicable."
 
@@ -153,14 +154,35 @@ def register_management_tools(engine):
         return "Heartbeat missing."
 
     @mcp.tool()
-    def get_wal_tail(count: int = 10) -> str:
+    async def get_wal_tail(count: int = 10) -> str:
         """[Forensics] Returns the last N entries from the Write-Ahead Log (Audit Log)."""
-        return json.dumps(engine.logger.get_wal_tail(count))
+        # Beyond the in-memory ring this flushes the writer and reads back through segments
+        return json.dumps(await asyncio.to_thread(engine.logger.get_wal_tail, count))
 
     @mcp.tool()
-    def get_bridge_pulse() -> str:
+    async def verify_wal_chain(workers: int = 0) -> str:
+        """[Forensics] Verifies every hash and link of the Write-Ahead Log in parallel. Reports the byte offset of each break."""
+        from vibe_logging.wal_chain import verify_chain
+        files = await asyncio.to_thread(engine.logger.wal_files) # Flushes the writer first
+        report = await asyncio.to_thread(verify_chain, files, workers=workers or None)
+        return json.dumps(report, indent=2)
+
+    @mcp.tool()
+    async def query_wal(action: str = "", since: str = "", until: str = "", target: str = "", limit: int = 100) -> str:
+        """
+        [Forensics] Finds WAL entries across all (rotated and compressed) segments via their index.
+        action: exact tool/intent name. since/until: ISO-8601 timestamps or prefixes (e.g. '2026-10-18').
+        target: substring of the entry's object path. Returns the newest `limit` matches, oldest first.
+        """
+        if limit < 1: return json.dumps({"error": "INVALID_LIMIT", "message": "limit must be >= 1"})
+        # Flushes the writer, then scans and decompresses segments: keep it off the event loop
+        return json.dumps(await asyncio.to_thread(engine.logger.query, action=action or None, since=since or None,
+                                                  until=until or None, target=target or None, limit=limit))
+
+    @mcp.tool()
+    async def get_bridge_pulse() -> str:
         """Returns a compact, 1-line status summary of the entire VibeBridge stack."""
-        status = engine.unity_request("status")
+        status = await engine.async_unity_request("status")
         # Extract metadata from the invariance block
         invariance = status.get("_vibe_invariance", {})
         pulse = [
@@ -173,7 +195,25 @@ def register_management_tools(engine):
         return " | ".join(pulse)
 
     @mcp.tool()
-    def stabilize_and_start() -> str:
+    def get_airlock_stats() -> str:
+        """[Telemetry] Returns IPC performance counters (routing, connection reuse, queue and wait latency, audit caches, WAL writer)."""
+        stats = engine.airlock.get_stats()
+        stats["async"] = engine.async_airlock.get_stats()
+        stats["wal"] = engine.logger.get_stats()
+        try:
+            from scripts.security_gate import SecurityGate
+            stats["security_gate"] = SecurityGate.get_stats()
+        except Exception: pass
+        return json.dumps(stats, indent=2)
+
+    @mcp.tool()
+    def flush_response_cache() -> str:
+        """[Telemetry] Drops cached read responses (use after editing the scene by hand in Unity)."""
+        engine.airlock.response_cache.invalidate()
+        return json.dumps(engine.airlock.response_cache.get_stats())
+
+    @mcp.tool()
+    async def stabilize_and_start() -> str:
         """Automatically detects and resolves zombie processes or port conflicts, then initializes the bridge."""
         import subprocess
         report = []
@@ -189,7 +229,7 @@ def register_management_tools(engine):
 
         # 2. Re-trigger Unity Kernel
         engine.set_activity("STABILIZING_KERNEL")
-        res = engine.unity_request("status")
+        res = await engine.async_unity_request("status")
         report.append(f"Kernel Status: {res.get('_vibe_invariance', {}).get('unity_status', 'Ready')}")
         
         return "\n".join(report) if report else "System already stable."
@@ -1,44 +1,44 @@
+import json
+
 def register_payload_tools(engine):
     mcp = engine.mcp
 
     @mcp.tool()
-    def audit_avatar(path: str) -> str:
+    async def audit_avatar(path: str) -> str:
         """[Payload] Returns a report on meshes and materials."""
-        return str(engine.unity_request("audit/avatar", {"path": path}, intent="AUDIT"))
+        return str(await engine.async_unity_request("audit/avatar", {"path": path}, intent="AUDIT"))
 
     @mcp.tool()
-    def crush_textures(path: str, max_size: int = 512) -> str:
+    async def crush_textures(path: str, max_size: int = 512) -> str:
         """[Payload] Downscales textures."""
-        return str(engine.unity_request("texture/crush", {"path": path, "maxSize": max_size}, is_mutation=True, intent="OPTIMIZE"))
+        return str(await engine.async_unity_request("texture/crush", {"path": path, "maxSize": max_size}, is_mutation=True, intent="OPTIMIZE"))
 
     @mcp.tool()
-    def register_object(path: str, role: str, group: str = "default", slot_index: int = 0) -> str:
+    async def register_object(path: str, role: str, group: str = "default", slot_index: int = 0) -> str:
         """[Payload] Persists a semantic role for an object (e.g. 'MainBody')."""
-        return str(engine.unity_request("registry/add", {"path": path, "role": role, "group": group, "slotIndex": slot_index}, is_mutation=True, intent="REGISTRY"))
+        return str(await engine.async_unity_request("registry/add", {"path": path, "role": role, "group": group, "slotIndex": slot_index}, is_mutation=True, intent="REGISTRY"))
 
     @mcp.tool()
-    def get_state_hash() -> str:
+    async def get_state_hash() -> str:
         """[Auditing] Returns a snapshot hash of the scene state for multi-agent coordination."""
-        return str(engine.unity_request("system/state-hash"))
+        return str(await engine.async_unity_request("system/state-hash"))
 
     @mcp.tool()
-    def verify_identity_parity(references: str) -> str:
+    async def verify_identity_parity(references: str) -> str:
         """
         Instantly verifies if a list of objects (comma-separated UUIDs or sem:Roles) still exist.
         Returns a simple FOUND/MISSING status for each.
         """
-        refs = [r.strip() for h in references.split(",")]
-        results = {}
-        for r in refs:
-            # Quick check via inspect primitive
-            res = engine.unity_request("inspect", {"path": r})
-            results[r] = "FOUND" if "error" not in res else "MISSING"
+        refs = [r.strip() for r in references.split(",")]
+        # Quick check via inspect primitive, batched into as few round trips as possible
+        responses = await engine.async_airlock.request_many([("inspect", {"path": r}) for r in refs])
+        results = {r: "FOUND" if not res.get("error") else "MISSING" for r, res in zip(refs, responses)}
         return json.dumps(results)
         
     @mcp.tool()
-    def list_available_tools() -> str:
+    async def list_available_tools() -> str:
         """Returns a list of all installed VibeTools."""
-        return str(engine.unity_request("system/list-tools"))
+        return str(await engine.async_unity_request("system/list-tools"))
 
     @mcp.tool()
     def update_derived_belief(key: str, statement: str, provenance_hashes: str) -> str:
@@ -48,12 +48,8 @@ def register_payload_tools(engine):
         """
         hashes = [h.strip() for h in provenance_hashes.split(",")]
         # Fetch current tick from latest unity context if available
-        tick = 0
-        try:
-            # Fallback to local heartbeat if necessary
-            with open(os.path.join(engine.project_path, "metadata", "vibe_health.json"), "r") as f:
-                tick = json.load(f).get("monotonicTick", 0)
-        except: pass
+        # Fallback to local heartbeat if necessary
+        tick = engine.airlock.metadata.get_health().get("monotonicTick", 0)
         
         engine.logger.update_belief(key, statement, hashes, tick)
         return json.dumps({"message": f"Belief '{key}' committed to ledger with provenance."})
@@ -1,8 +1,28 @@
 import os
 import json
+import time
+import queue
+import atexit
 import datetime
+import threading
+from collections import deque
+from .wal_chain import seal, is_kernel_entry, GENESIS
+from .wal_segments import WalSegments, read_last_lines
 
 class VibeLogger:
+    """
+    Writes the WAL (hash-chained, segmented) and keeps its recent tail in memory.
+    Entries are sealed onto the chain when logged, then written by a background
+    group-commit thread. Durability (performance.wal_durability):
+    "none" batches without fsync, "batch" fsyncs each batch, and "strict" writes
+    and fsyncs every entry before the call returns. A batch that fails to write
+    stays pending and is retried in order; in strict mode the entry is taken back
+    off the chain and the OSError raised to the caller.
+    """
+    TAIL_SIZE = 256 # Most recent WAL entries kept in memory for get_wal_tail
+    DURABILITY = ("none", "batch", "strict")
+    MAX_BATCH = 512
+
     def __init__(self, project_path):
         self.log_dir = os.path.join(project_path, "logs")
         self.wal_path = os.path.join(self.log_dir, "vibe_audit.jsonl")
@@ -12,10 +32,42 @@ class VibeLogger:
         self.drift_budget = 5 # Allowed deviations before human intervention
         self.idempotency_map = {}
         self.belief_ledger = {} # key -> {belief, provenance, confidence, expires_at_tick}
+        self._tail = deque(maxlen=self.TAIL_SIZE)
+        self._tail_offset = None # WAL byte offset the ring is current up to (None: not loaded)
+        self._head = GENESIS # entryHash of the last WAL line; new entries chain onto it
+        self._own_head = GENESIS # entryHash of the last entry this side wrote (see wal_chain)
+        self._tail_lock = threading.RLock()
+        self._drained = threading.Condition(self._tail_lock)
+        self._pending = 0 # Sealed (and in the ring) but not yet on disk
+        self._writing = False # A batch is being appended outside the lock
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
         self._load_beliefs()
 
+        perf = self._load_settings(project_path).get("performance", {})
+        self.segments = WalSegments(self.log_dir, os.path.basename(self.wal_path),
+                                    segment_bytes=int(perf.get("wal_segment_mb", 64) * 2**20),
+                                    segment_seconds=perf.get("wal_segment_hours", 24) * 3600)
+        self.segments.recover()
+
+        self.durability = perf.get("wal_durability", "batch")
+        if self.durability not in self.DURABILITY: self.durability = "batch"
+        self.wal_stats = {"entries": 0, "batches": 0, "fsyncs": 0, "max_batch": 0, "max_queue_depth": 0,
+                          "write_errors": 0, "rotate_errors": 0, "last_error": None, "last_write_ms": 0.0, "max_write_ms": 0.0,
+                          "total_write_ms": 0.0}
+        self._queue = queue.Queue()
+        self._closed = False
+        self._writer = None
+        if self.durability != "strict":
+            self._writer = threading.Thread(target=self._run_writer, name="VibeWalWriter", daemon=True)
+            self._writer.start()
+        atexit.register(self.close)
+
+    def _load_settings(self, project_path):
+        try:
+            with open(os.path.join(project_path, "metadata", "vibe_settings.json"), "r") as f: return json.load(f)
+        except (OSError, ValueError): return {}
+
     def update_belief(self, key, statement, provenance, current_tick, ttl=100):
         """Updates the belief ledger with provenance and TTL (Confidence Decay)."""
         self.belief_ledger[key] = {
@@ -79,14 +131,217 @@ class VibeLogger:
         self._write(entry)
 
     def get_wal_tail(self, count=10):
-        if not os.path.exists(self.wal_path): return []
+        """Latest `count` WAL entries, served from the in-memory ring (beyond it, read back across segments)."""
+        if count <= 0: return []
+        if count > self.TAIL_SIZE: self.flush() # Read from disk, so let queued entries land first
         try:
-            with open(self.wal_path, "r") as f:
-                lines = f.readlines()
-                return [json.loads(l) for l in lines[-count:]]
-        except: return []
+            with self._tail_lock:
+                self._sync_tail()
+                if count <= self.TAIL_SIZE: return list(self._tail)[-count:]
+                ring = list(self._tail)
+                queued = ring[len(ring) - min(self._pending, len(ring)):] # Still unwritten (e.g. a failing disk)
+                need = count - len(queued)
+                # Up to the ring's offset only: bytes past it may be a batch that is being appended
+                lines = read_last_lines(self.wal_path, need, size=self._tail_offset)[0] if self._tail_offset else []
+                if len(lines) < need: lines = self.segments.tail_lines(need - len(lines)) + lines
+                return [e for e in map(self._parse, lines) if e is not None] + queued
+        except OSError: return []
+
+    def query(self, action=None, since=None, until=None, target=None, limit=100):
+        """Indexed lookup across the active and rotated WAL segments (see WalSegments.query)."""
+        self.flush()
+        return self.segments.query(action=action, since=since, until=until, target=target, limit=limit)
+
+    def wal_files(self):
+        """Every WAL file in hash-chain order, for wal_chain.verify_chain."""
+        self.flush()
+        return self.segments.files()
+
+    def head_hash(self):
+        """Current head of the WAL hash chain, from memory (kernel appends are folded in on the next write or tail read)."""
+        with self._tail_lock:
+            if self._tail_offset is None:
+                try: self._sync_tail()
+                except OSError: pass
+            return self._head
+
+    def _parse(self, line):
+        try: return json.loads(line)
+        except ValueError: return None # Torn or foreign line
+
+    def _sync_tail(self):
+        """Brings the ring up to date with the WAL, including lines appended by the kernel."""
+        try: size = os.path.getsize(self.wal_path)
+        except OSError: size = 0 # Not created yet, or just rotated
+        if self._tail_offset is None or size < self._tail_offset: # Cold start, or the WAL was truncated
+            lines, self._tail_offset = read_last_lines(self.wal_path, self.TAIL_SIZE) if size else ([], 0)
+            if len(lines) < self.TAIL_SIZE: # The head (and recent history) may be in the last rotated segment
+                lines = self.segments.tail_lines(self.TAIL_SIZE - len(lines)) + lines
+            self._tail.clear()
+            if not self._pending: self._head = self._own_head = GENESIS
+            self._append_lines(lines)
+        elif size > self._tail_offset and not self._writing: # Mid-append, the new bytes are (partly) our own batch
+            with open(self.wal_path, "rb") as f:
+                f.seek(self._tail_offset)
+                data = f.read(size - self._tail_offset)
+            cut = data.rfind(b"\n") + 1
+            self._append_lines(data[:cut].splitlines())
+            self._tail_offset += cut
+
+    def _append_lines(self, lines):
+        entries = [e for e in map(self._parse, lines) if isinstance(e, dict)]
+        if self._pending: # On disk these precede the queued entries, which are already chained past them
+            queued = [self._tail.pop() for _ in range(min(self._pending, len(self._tail)))][::-1]
+            self._tail.extend(entries + queued)
+            return
+        for entry in entries:
+            self._tail.append(entry)
+            self._head = entry.get("entryHash") or GENESIS
+            if not is_kernel_entry(entry): self._own_head = self._head
+
+    def _fold(self, start, stop):
+        """Takes in lines another writer appended in [start, stop) of the active segment."""
+        with open(self.wal_path, "rb") as f:
+            f.seek(start)
+            data = f.read(stop - start)
+        self._append_lines(data[:data.rfind(b"\n") + 1].splitlines())
+
+    # --- WRITER ---
 
     def _write(self, entry):
-        with open(self.wal_path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        """Seals the entry onto the chain in memory and hands it to the writer (strict: writes it now)."""
+        with self._tail_lock:
+            if self._closed and self._writer: # Let queued entries land first: they precede this one on the chain
+                self._drained.wait_for(lambda: self._pending == 0 or not self._writer.is_alive(), 10.0)
+            if self._tail_offset is None or self.durability == "strict":
+                self._sync_tail() # The head may have moved under kernel appends
+            direct = self.durability == "strict" or (self._closed and not self._pending)
+            head, own_head = self._head, self._own_head
+            line = seal(entry, head, own_head).encode()
+            self._head = self._own_head = entry["entryHash"]
+            self._tail.append(entry)
+            self._pending += 1
+            if direct:
+                try: self._write_batch([line])
+                except OSError: # Not on disk: take it back off the chain so the next entry links to the real head
+                    if self._tail and self._tail[-1] is entry: self._tail.pop()
+                    self._head, self._own_head = head, own_head
+                    self._pending -= 1
+                    self._drained.notify_all()
+                    if self.durability == "strict": raise
+                return
+            self._queue.put(line) # Under the lock: queue order is chain order
+            self.wal_stats["max_queue_depth"] = max(self.wal_stats["max_queue_depth"], self._queue.qsize())
+
+    def _run_writer(self):
+        stop = False
+        while True:
+            with self._tail_lock: # Once drained after close(), entries are written directly by _write
+                if stop and self._queue.empty(): return
+            item = self._queue.get()
+            batch, stop = [], False
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.MAX_BATCH: break
+                try: item = self._queue.get_nowait()
+                except queue.Empty: break
+            else:
+                stop = True
+            delay = 0.05
+            while batch:
+                try:
+                    self._write_batch(batch)
+                    break
+                except OSError: # Still pending and first in line: later entries chain onto it
+                    time.sleep(delay)
+                    delay = min(delay * 2, 2.0)
+
+    def _write_batch(self, lines):
+        """
+        One append (and at most one fsync) for a group of sealed entries, outside the logger lock.
+        On OSError none of the batch is left on disk, it stays pending and the error is re-raised.
+        """
+        data = b"".join(lines)
+        start = time.perf_counter()
+        try:
+            with self._tail_lock:
+                self._sync_tail()
+                self._writing = True
+            with open(self.wal_path, "ab", buffering=0) as f:
+                written = 0
+                try:
+                    while written < len(data): written += f.write(data[written:])
+                    if self.durability != "none":
+                        os.fsync(f.fileno())
+                        self.wal_stats["fsyncs"] += 1
+                except OSError:
+                    # Cut a torn or unsynced batch off (unless the kernel appended after it) before it is retried
+                    if written and os.fstat(f.fileno()).st_size == f.tell(): f.truncate(f.tell() - written)
+                    raise
+                end = f.tell()
+        except OSError as e:
+            with self._tail_lock:
+                self._writing = False
+                self.wal_stats["write_errors"] += 1
+                self.wal_stats["last_error"] = str(e)
+            raise
+
+        with self._tail_lock:
+            self._writing = False
+            try:
+                if end - len(data) > self._tail_offset: self._fold(self._tail_offset, end - len(data))
+                self._tail_offset = end
+            except OSError: pass
+            finally:
+                self._pending -= len(lines)
+                self._drained.notify_all()
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stats = self.wal_stats
+            stats["entries"] += len(lines)
+            stats["batches"] += 1
+            stats["max_batch"] = max(stats["max_batch"], len(lines))
+            stats["last_write_ms"] = round(elapsed_ms, 3)
+            stats["max_write_ms"] = round(max(stats["max_write_ms"], elapsed_ms), 3)
+            stats["total_write_ms"] += elapsed_ms
+            if self.segments.should_rotate(end):
+                try: self._rotate()
+                except OSError as e: # The batch is on disk either way; the next batch tries again
+                    stats["rotate_errors"] += 1
+                    stats["last_error"] = str(e)
+
+    def flush(self, timeout=10.0):
+        """Blocks until every logged entry is on disk. Returns False on timeout."""
+        with self._drained:
+            return self._drained.wait_for(lambda: self._pending == 0 or not (self._writer and self._writer.is_alive()), timeout)
+
+    def close(self):
+        """Drains the queue and stops the writer; later entries are written synchronously."""
+        with self._tail_lock:
+            if self._closed: return
+            self._closed = True
+            if self._writer: self._queue.put(None)
+        if self._writer: self._writer.join(timeout=10.0)
+
+    def get_stats(self):
+        with self._tail_lock:
+            stats = dict(self.wal_stats, durability=self.durability, queue_depth=self._queue.qsize(), pending=self._pending)
+        stats["total_write_ms"] = round(stats["total_write_ms"], 3)
+        stats["avg_batch"] = round(stats["entries"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["avg_write_ms"] = round(stats["total_write_ms"] / stats["batches"], 3) if stats["batches"] else 0.0
+        stats["segments"] = self.segments.get_stats()
+        return stats
 
+    def _rotate(self):
+        """Starts a new segment. The ring (and with it the chain head) carries over the rename."""
+        self._sync_tail()
+        offset = self._tail_offset
+        raw = self.segments.rotate()
+        self._tail_offset = 0
+        if not raw: return
+        try: # Kernel lines that landed between the sync and the rename
+            with open(raw, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+            self._append_lines(data[:data.rfind(b"\n") + 1].splitlines())
+        except OSError: pass
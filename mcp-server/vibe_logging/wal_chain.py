@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import gzip
+import glob
+import hashlib
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# UnityVibeBridge: WAL hash chain.
+# Python entries hash their own JSON (without entryHash) and link to the line before
+# them, or to any line since the previous Python entry (the kernel may append while
+# a batch is queued); when kernel lines sit in between they also carry prevOwn, the
+# previous Python entry, so no Python entry can be dropped unnoticed. Kernel entries (LogMutation)
+# hash their JsonUtility form and link to the previous kernel entry. Both sub-chains
+# restart at GENESIS when their writer restarts without knowing its last entry.
+
+GENESIS = "GENESIS"
+KERNEL_FIELDS = ("prevHash", "timestamp", "capability", "action", "details", "entryHash")
+MIN_SEGMENT = 8 * 2**20 # Below this a segment is not worth a worker
+MAX_WORKERS = 4 # Default cap: verification shares the machine with the editor
+
+def entry_hash(entry):
+    body = {k: v for k, v in entry.items() if k != "entryHash"}
+    return hashlib.sha256(json.dumps(body).encode()).hexdigest()
+
+def seal(entry, prev_hash, own_prev=GENESIS):
+    """Chains `entry` onto prev_hash (and own_prev) in place. Returns the WAL line (serialized once)."""
+    entry.pop("entryHash", None)
+    entry["prevHash"] = prev_hash
+    if own_prev != prev_hash: entry["prevOwn"] = own_prev
+    body = json.dumps(entry)
+    entry["entryHash"] = hashlib.sha256(body.encode()).hexdigest()
+    return f'{body[:-1]}, "entryHash": "{entry["entryHash"]}"}}\n' # == json.dumps(entry)
+
+def kernel_hash(entry):
+    """Emulates JsonUtility.ToJson(AuditEntry) as hashed by the kernel (entryHash still empty)."""
+    body = {f: entry.get(f) or "" for f in KERNEL_FIELDS}
+    body["entryHash"] = ""
+    return hashlib.sha256(json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()).hexdigest()
+
+def is_kernel_entry(entry):
+    return "capability" in entry and "type" not in entry
+
+# --- VERIFICATION ---
+
+def verify_segment(path, start, end):
+    """
+    Streams lines in [start, end) (a compressed segment is read whole). Links into
+    the previous segment are unknown here, so the first of each is returned for
+    the caller to stitch. Offsets are into the uncompressed stream.
+    """
+    seg = {"file": os.path.basename(path), "entries": 0, "unchained": 0, "errors": [], "torn_tail": False,
+           "first_link": None, "first_own": None, "first_kernel": None,
+           "last_hash": None, "last_own": None, "last_kernel": None, "window": None, "kernels": []}
+    own_prev = kernel_prev = None # None: decided by the previous segment
+    window = None # Hashes a Python entry may link to: the last Python entry and kernel lines since
+    name = seg["file"]
+    if not os.path.exists(path) and os.path.exists(path + ".gz"): path += ".gz" # Sealed since it was listed
+    with (gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")) as f:
+        f.seek(start)
+        offset = start
+        while end is None or offset < end:
+            line = f.readline()
+            if not line: break
+            at, offset = offset, offset + len(line)
+            try: entry = json.loads(line)
+            except ValueError:
+                if not line.endswith(b"\n"): seg["torn_tail"] = True # Still being written
+                else: seg["errors"].append({"file": name, "offset": at, "kind": "unparsable"})
+                continue
+            if not isinstance(entry, dict):
+                seg["errors"].append({"file": name, "offset": at, "kind": "unparsable"})
+                continue
+            seg["entries"] += 1
+            digest = entry.get("entryHash")
+            if not digest: # Written before the chain existed; whatever follows restarts it
+                seg["unchained"] += 1
+                seg["last_hash"] = GENESIS
+                window = {GENESIS}
+                if not is_kernel_entry(entry): own_prev = seg["last_own"] = GENESIS
+                continue
+
+            link = entry.get("prevHash")
+            if is_kernel_entry(entry):
+                if kernel_hash(entry) != digest: seg["errors"].append({"file": name, "offset": at, "kind": "kernel_hash"})
+                if kernel_prev is None:
+                    if seg["first_kernel"] is None: seg["first_kernel"] = (at, link)
+                elif link not in (kernel_prev, GENESIS):
+                    seg["errors"].append({"file": name, "offset": at, "kind": "kernel_link"})
+                kernel_prev = seg["last_kernel"] = digest
+                if window is None: seg["kernels"].append(digest)
+                else: window.add(digest)
+            else:
+                if entry_hash(entry) != digest: seg["errors"].append({"file": name, "offset": at, "kind": "hash"})
+                if window is None: seg["first_link"] = (at, link)
+                elif link not in window: seg["errors"].append({"file": name, "offset": at, "kind": "link"})
+                own = entry.get("prevOwn", link)
+                if own_prev is None:
+                    if seg["first_own"] is None: seg["first_own"] = (at, own)
+                elif own not in (own_prev, GENESIS):
+                    seg["errors"].append({"file": name, "offset": at, "kind": "own_link"})
+                own_prev = seg["last_own"] = digest
+                window = {digest}
+            seg["last_hash"] = digest
+    seg["window"] = sorted(window) if window is not None else None
+    return seg
+
+def split_segments(path, parts):
+    """Byte ranges of roughly equal size, each starting at a line boundary."""
+    size = os.path.getsize(path)
+    parts = max(1, min(parts, size // MIN_SEGMENT))
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, bounds[-1]))
+            f.readline()
+            if f.tell() < size: bounds.append(f.tell())
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+def wal_files(log_dir, name="vibe_audit.jsonl"):
+    """Rotated segments (see wal_segments) in order, then the active segment."""
+    stem = name.rsplit(".jsonl", 1)[0]
+    rotated = {}
+    paths = glob.glob(os.path.join(log_dir, "wal", f"{stem}.[0-9]*.jsonl"))
+    paths += glob.glob(os.path.join(log_dir, "wal", f"{stem}.[0-9]*.jsonl.gz")) # Not a seal's .gz.tmp
+    for path in paths:
+        seq = os.path.basename(path)[len(stem) + 1:].split(".")[0]
+        if path.endswith(".gz") or seq not in rotated: rotated[seq] = path # Prefer the sealed copy
+    return [rotated[s] for s in sorted(rotated)] + [os.path.join(log_dir, name)]
+
+def verify_chain(paths, workers=None, max_errors=100):
+    """
+    Verifies every hash and link of the WAL files (in chain order), streaming segments
+    on a process pool. Workers are spawned, not forked, so this is safe to call from
+    the threaded MCP server.
+    """
+    start = time.time()
+    workers = workers or min(MAX_WORKERS, os.cpu_count() or 1)
+    if isinstance(paths, str): paths = [paths]
+    units = []
+    for path in paths:
+        if not os.path.exists(path):
+            if not os.path.exists(path + ".gz"): continue
+            path += ".gz" # Sealed since it was listed
+        if path.endswith(".gz"): units.append((path, 0, None))
+        else: units.extend((path, a, b) for a, b in split_segments(path, workers * 4))
+    if workers > 1 and len(units) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(units)), mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(verify_segment, *zip(*units)))
+    else:
+        results = [verify_segment(*u) for u in units]
+
+    report = {"entries": 0, "unchained": 0, "errors": [], "torn_tail": False}
+    head, own_prev, kernel_prev = GENESIS, GENESIS, GENESIS
+    window = {GENESIS}
+    for seg in results:
+        if seg["first_link"] and seg["first_link"][1] not in window and seg["first_link"][1] not in seg["kernels"]:
+            report["errors"].append({"file": seg["file"], "offset": seg["first_link"][0], "kind": "link"})
+        if seg["first_own"] and seg["first_own"][1] not in (own_prev, GENESIS):
+            report["errors"].append({"file": seg["file"], "offset": seg["first_own"][0], "kind": "own_link"})
+        if seg["first_kernel"] and seg["first_kernel"][1] not in (kernel_prev, GENESIS):
+            report["errors"].append({"file": seg["file"], "offset": seg["first_kernel"][0], "kind": "kernel_link"})
+        if seg["window"] is not None: window = set(seg["window"])
+        else: window.update(seg["kernels"])
+        if seg["last_hash"] is not None: head = seg["last_hash"]
+        if seg["last_own"] is not None: own_prev = seg["last_own"]
+        if seg["last_kernel"] is not None: kernel_prev = seg["last_kernel"]
+        report["entries"] += seg["entries"]
+        report["unchained"] += seg["unchained"]
+        report["errors"].extend(seg["errors"])
+        report["torn_tail"] = seg["torn_tail"]
+
+    order = {os.path.basename(p): i for i, p in enumerate(paths)}
+    errors = sorted(report["errors"], key=lambda e: (order.get(e["file"], 0), e["offset"]))
+    elapsed = time.time() - start
+    size = sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+    report.update({
+        "ok": not errors,
+        "error_count": len(errors),
+        "errors": errors[:max_errors],
+        "head": head,
+        "files": len(paths),
+        "segments": len(units),
+        "bytes": size,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "mb_per_s": round(size / 2**20 / elapsed, 1) if elapsed > 0 else None
+    })
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify the WAL hash chain.")
+    parser.add_argument("paths", nargs="*", help="WAL files in chain order (default: logs/wal/* then logs/vibe_audit.jsonl)")
+    parser.add_argument("--workers", type=int, default=0, help=f"Processes (default: up to {MAX_WORKERS})")
+    args = parser.parse_args()
+    report = verify_chain(args.paths or wal_files("logs"), workers=args.workers or None)
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["ok"] else 1)
@@ -0,0 +1,300 @@
+import os
+import re
+import json
+import gzip
+import time
+import datetime
+import threading
+from .wal_chain import wal_files
+
+SEGMENT_NAME = re.compile(r"^(?P<stem>.+)\.(?P<seq>\d{6})\.jsonl(?P<gz>\.gz)?$")
+
+def read_last_lines(path, count, block_size=65536, size=None):
+    """
+    Returns (lines, end): the last `count` complete lines of a file (or of its first
+    `size` bytes) as bytes and the offset just past the last newline. Reads backwards
+    in blocks, so the cost depends on `count`, not on the size of the file.
+    """
+    with open(path, "rb") as f:
+        eof = f.seek(0, os.SEEK_END)
+        size = pos = eof if size is None else min(size, eof)
+        data = b""
+        while pos > 0 and data.count(b"\n") <= count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    cut = data.rfind(b"\n") + 1 # A trailing partial line is still being written
+    lines = data[:cut].splitlines()
+    if pos > 0: lines = lines[1:] # The first line may start before the block we read
+    return lines[-count:] if count else [], size - (len(data) - cut)
+
+def index_row(entry):
+    """(timestamp, action, target) of a WAL entry, for Python and kernel entries alike."""
+    action = entry.get("action") or entry.get("intent") or ""
+    target = ""
+    for key in ("payload", "details"):
+        value = entry.get(key)
+        if isinstance(value, dict):
+            t = value.get("path") or value.get("target")
+            if isinstance(t, str):
+                target = t
+                break
+    return str(entry.get("timestamp") or ""), str(action), target
+
+def parse_timestamp(ts):
+    try: return datetime.datetime.strptime(ts[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=datetime.timezone.utc).timestamp()
+    except (TypeError, ValueError): return None
+
+def _matches(row, action, since, until, target):
+    ts, act, tgt = row[0], row[1], row[2]
+    # ISO-8601 timestamps (and prefixes such as '2026-10-18') compare lexically
+    return (not action or act == action) and (not since or ts >= since) and \
+           (not until or ts <= until) and (not target or target in tgt)
+
+class WalSegments:
+    """
+    UnityVibeBridge: Segmented WAL storage.
+    The active segment stays at logs/vibe_audit.jsonl (the kernel appends there).
+    Once it outgrows `segment_bytes` or `segment_seconds` it is renamed into
+    logs/wal/ and sealed in the background: gzip'd in independently compressed
+    blocks, with a sidecar index of (timestamp, action, target) -> (block, offset).
+    Queries prune segments by time range and decompress only the blocks holding
+    matches; the active segment is indexed incrementally as it grows.
+    """
+    FORMAT = 1
+    INDEX_CACHE = 8
+
+    def __init__(self, log_dir, active_name="vibe_audit.jsonl", segment_bytes=64 * 2**20,
+                 segment_seconds=86400, block_bytes=2**20):
+        self.log_dir = log_dir
+        self.active_path = os.path.join(log_dir, active_name)
+        self.stem = active_name.rsplit(".jsonl", 1)[0]
+        self.segment_dir = os.path.join(log_dir, "wal")
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.block_bytes = block_bytes
+        self._lock = threading.RLock() # Rotation vs. listing and active-segment indexing
+        self._started = None # Epoch of the active segment's first entry
+        self._active = {"ino": None, "offset": 0, "rows": []}
+        self._indexes = {} # index path -> loaded index (bounded)
+        self.stats = {"rotations": 0, "sealed": 0, "queries": 0, "blocks_read": 0, "segments_skipped": 0}
+
+    # --- LAYOUT ---
+
+    def _segment_path(self, seq, gz=False):
+        return os.path.join(self.segment_dir, f"{self.stem}.{seq:06d}.jsonl" + (".gz" if gz else ""))
+
+    def _index_path(self, seq):
+        return os.path.join(self.segment_dir, f"{self.stem}.{seq:06d}.idx.json")
+
+    def segments(self):
+        """[(seq, path, sealed)] oldest first. A sealed segment is its .gz plus a written index."""
+        found = {}
+        try: names = os.listdir(self.segment_dir)
+        except OSError: return []
+        for name in names:
+            m = SEGMENT_NAME.match(name)
+            if not m or m.group("stem") != self.stem: continue
+            seq = int(m.group("seq"))
+            if m.group("gz"):
+                if os.path.exists(self._index_path(seq)): found[seq] = (seq, os.path.join(self.segment_dir, name), True)
+            else:
+                found.setdefault(seq, (seq, os.path.join(self.segment_dir, name), False))
+        return [found[s] for s in sorted(found)]
+
+    def files(self):
+        """Every WAL file in chain order, the active segment last."""
+        with self._lock:
+            return wal_files(self.log_dir, os.path.basename(self.active_path))
+
+    # --- ROTATION ---
+
+    def should_rotate(self, size):
+        if size >= self.segment_bytes: return True
+        if self._started is None:
+            self._started = self._first_timestamp() or time.time()
+        return size > 0 and time.time() - self._started >= self.segment_seconds
+
+    def _first_timestamp(self):
+        try:
+            with open(self.active_path, "rb") as f: return parse_timestamp(json.loads(f.readline()).get("timestamp"))
+        except (OSError, ValueError, AttributeError): return None
+
+    def rotate(self):
+        """Moves the active segment into logs/wal/ and seals it in the background."""
+        with self._lock:
+            if not os.path.exists(self.active_path): return None
+            os.makedirs(self.segment_dir, exist_ok=True)
+            existing = self.segments()
+            raw = self._segment_path(existing[-1][0] + 1 if existing else 1)
+            os.replace(self.active_path, raw)
+            self._started = time.time()
+            self._active = {"ino": None, "offset": 0, "rows": []}
+            self.stats["rotations"] += 1
+        threading.Thread(target=self._seal_quietly, args=(raw,), name="VibeWalSeal", daemon=True).start()
+        return raw
+
+    def recover(self):
+        """Seals segments left raw by an interrupted run."""
+        pending = [p for _, p, sealed in self.segments() if not sealed]
+        if pending:
+            threading.Thread(target=lambda: [self._seal_quietly(p) for p in pending], name="VibeWalSeal", daemon=True).start()
+
+    def _seal_quietly(self, raw):
+        try: self.seal(raw)
+        except OSError: pass # Stays raw (still queryable) and is retried by recover()
+
+    def seal(self, raw):
+        """Compresses a raw segment block by block and writes its index."""
+        seq = int(SEGMENT_NAME.match(os.path.basename(raw)).group("seq"))
+        gz_path, index_path = self._segment_path(seq, gz=True), self._index_path(seq)
+        rows, blocks, block = [], [], bytearray()
+        with open(raw, "rb") as src, open(gz_path + ".tmp", "wb") as dst:
+            def flush():
+                data = gzip.compress(bytes(block), 6)
+                blocks.append([dst.tell(), len(data)])
+                dst.write(data)
+                block.clear()
+            for line in src:
+                try: entry = json.loads(line)
+                except ValueError: entry = None
+                if isinstance(entry, dict):
+                    rows.append(list(index_row(entry)) + [len(blocks), len(block), len(line)])
+                block += line
+                if len(block) >= self.block_bytes: flush()
+            if block: flush()
+
+        stamps = [r[0] for r in rows if r[0]]
+        index = {"format": self.FORMAT, "segment": os.path.basename(gz_path), "entries": len(rows),
+                 "first_ts": min(stamps) if stamps else None, "last_ts": max(stamps) if stamps else None,
+                 "blocks": blocks, "rows": rows}
+        with open(index_path + ".tmp", "w") as f: json.dump(index, f, separators=(",", ":"))
+        with self._lock:
+            os.replace(gz_path + ".tmp", gz_path)
+            os.replace(index_path + ".tmp", index_path)
+            os.remove(raw)
+            self.stats["sealed"] += 1
+
+    # --- READING ---
+
+    def _load_index(self, seq):
+        path = self._index_path(seq)
+        index = self._indexes.get(path)
+        if index is None:
+            with open(path, "r") as f: index = json.load(f)
+            if len(self._indexes) >= self.INDEX_CACHE: self._indexes.pop(next(iter(self._indexes)))
+            self._indexes[path] = index
+        return index
+
+    def _read_blocks(self, path, blocks, wanted):
+        """{block: decompressed bytes} for the wanted block numbers only."""
+        out = {}
+        with open(path, "rb") as f:
+            for b in sorted(wanted):
+                offset, length = blocks[b]
+                f.seek(offset)
+                out[b] = gzip.decompress(f.read(length))
+                self.stats["blocks_read"] += 1
+        return out
+
+    def _scan(self, path, start=0):
+        """Yields (offset, length, row) for complete lines of a plain segment."""
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"): break # Still being written
+                try: entry = json.loads(line)
+                except ValueError: entry = None
+                if isinstance(entry, dict): yield offset, len(line), index_row(entry)
+                offset += len(line)
+
+    def _active_rows(self):
+        """Index of the active segment, extended by the bytes appended since the last query."""
+        try: st = os.stat(self.active_path)
+        except OSError:
+            self._active = {"ino": None, "offset": 0, "rows": []}
+            return []
+        active = self._active
+        if active["ino"] != st.st_ino or st.st_size < active["offset"]:
+            active = self._active = {"ino": st.st_ino, "offset": 0, "rows": []}
+        if st.st_size > active["offset"]:
+            for offset, length, row in self._scan(self.active_path, active["offset"]):
+                active["rows"].append(row + (offset, length))
+                active["offset"] = offset + length
+        return active["rows"]
+
+    def _read_lines(self, path, spans):
+        out = []
+        with open(path, "rb") as f:
+            for offset, length in spans:
+                f.seek(offset)
+                out.append(f.read(length))
+        return out
+
+    def query(self, action=None, since=None, until=None, target=None, limit=100):
+        """Newest `limit` entries matching every given filter, returned oldest first."""
+        if limit < 1: raise ValueError("limit must be >= 1")
+        start = time.time()
+        found, scanned, skipped = [], 0, 0
+        with self._lock:
+            segments = self.segments()
+            active = [r for r in self._active_rows() if _matches(r, action, since, until, target)][-limit:]
+            if active:
+                try: found.extend(self._read_lines(self.active_path, [(r[3], r[4]) for r in active])[::-1])
+                except OSError: pass # Rotated away since it was indexed; the rows reappear in its segment
+
+        for seq, path, sealed in reversed(segments):
+            if len(found) >= limit: break
+            if sealed:
+                try: index = self._load_index(seq)
+                except (OSError, ValueError): continue
+                if (since and index["last_ts"] and index["last_ts"] < since) or \
+                   (until and index["first_ts"] and index["first_ts"] > until):
+                    skipped += 1
+                    continue
+                scanned += 1
+                rows = [r for r in index["rows"] if _matches(r, action, since, until, target)][-(limit - len(found)):]
+                try: data = self._read_blocks(path, index["blocks"], {r[3] for r in rows})
+                except OSError: continue
+                found.extend(data[r[3]][r[4]:r[4] + r[5]] for r in reversed(rows))
+            else:
+                scanned += 1
+                try: rows = [(o, n) for o, n, row in self._scan(path) if _matches(row, action, since, until, target)]
+                except OSError: continue # Sealed in the meantime
+                found.extend(self._read_lines(path, rows[-(limit - len(found)):])[::-1])
+
+        entries = []
+        for line in reversed(found[:limit]):
+            try: entries.append(json.loads(line))
+            except ValueError: pass
+        self.stats["queries"] += 1
+        self.stats["segments_skipped"] += skipped
+        return {"entries": entries, "count": len(entries), "truncated": len(found) >= limit,
+                "segments_scanned": scanned + 1, "segments_skipped": skipped,
+                "elapsed_ms": round((time.time() - start) * 1000, 3)}
+
+    def tail_lines(self, count):
+        """Last `count` lines of the rotated segments, newest last (extends the logger's tail past the active segment)."""
+        lines = []
+        with self._lock: # A seal swaps raw for .gz under this lock
+            for seq, path, sealed in reversed(self.segments()):
+                if len(lines) >= count: break
+                try: lines = self._segment_tail(seq, path, sealed, count - len(lines)) + lines
+                except (OSError, ValueError, KeyError): break # Never return a tail with a gap in it
+        return lines[-count:] if count > 0 else []
+
+    def _segment_tail(self, seq, path, sealed, count):
+        if not sealed: return read_last_lines(path, count)[0] # Only until its seal finishes
+        index = self._load_index(seq)
+        lines, blocks = [], len(index["blocks"])
+        while blocks and len(lines) < count: # Blocks hold whole lines
+            blocks -= 1
+            lines = self._read_blocks(path, index["blocks"], [blocks])[blocks].splitlines() + lines
+        return lines[-count:]
+
+    def get_stats(self):
+        segments = self.segments()
+        return dict(self.stats, segments=len(segments), unsealed=sum(1 for s in segments if not s[2]),
+                    segment_bytes=self.segment_bytes, segment_seconds=self.segment_seconds)
@@ -16,22 +16,26 @@ def scan_materials(project_path):
     with open(os.path.join(outbox, "res_scan_all.json"), 'r') as f:
         res = json.load(f)
     
-    # 2. List materials for each
-    for obj in res["results"]:
-        name = obj["message"]
-        list_cmd = {"action":"material/list","capability":"read","keys":["path"],"values":[name]}
-        with open(os.path.join(inbox, f"list_{name}.json"), 'w') as f:
-            json.dump(list_cmd, f)
-        
+    # 2. List materials for every renderer in ONE round trip (system/execute-recipe batch)
+    names = [obj["message"] for obj in res["results"]]
+    tools = [{"action":"material/list","capability":"read","keys":["path"],"values":[n]} for n in names]
+    batch_cmd = {"action":"system/execute-recipe","capability":"read","keys":["recipe"],"values":[json.dumps(tools)]}
+    with open(os.path.join(inbox, "scan_materials.json"), 'w') as f:
+        json.dump(batch_cmd, f)
+    
+    res_file = os.path.join(outbox, "res_scan_materials.json")
+    for _ in range(60):
+        if os.path.exists(res_file): break
         time.sleep(0.5)
-        try:
-            with open(os.path.join(outbox, f"res_list_{name}.json"), 'r') as f:
-                mats = json.load(f)
-                print(f"Object: {name}")
-                for m in mats["materials"]:
-                    print(f"  [{m['index']}] {m['name']}")
-        except:
-            pass
+    try:
+        with open(res_file, 'r') as f:
+            batch = json.loads(json.load(f)["payload"])
+        for name, mats in zip(names, batch):
+            print(f"Object: {name}")
+            for m in mats.get("materials", []):
+                print(f"  [{m['index']}] {m['name']}")
+    except:
+        pass
 
 if __name__ == "__main__":
     scan_materials("/home/bamn/ALCOM/Projects/BAMN-EXTO")
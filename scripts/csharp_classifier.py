@@ -0,0 +1,125 @@
+import re
+import json
+
+class CSharpClassifier:
+    """
+    UnityVibeBridge: Lexical C# detector for the airlock's pre-flight audit.
+    Decides whether a tool parameter is really C# before it is sent to the
+    compiler. JSON blobs, colour/vector literals and prose that merely contain
+    '{' or 'class ' are answered in microseconds; JSON is searched leaf by leaf
+    so code smuggled inside a recipe or data field still reaches the compiler.
+    The classifier is tuned for recall: when in doubt, it escalates.
+    """
+    # Cheap substring prefilter (the airlock's original trigger list)
+    CODE_HINTS = ("using ", "namespace ", "class ", "void ", "{", "public ", "static ")
+    THRESHOLD = 0.35
+
+    TOKEN = re.compile(r'''
+        (?P<comment>//[^\n]*|/\*.*?\*/)
+      | (?P<string>@?\$?"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>\d+(?:\.\d+)?[fFdDmMuUlL]?)
+      | (?P<ident>[A-Za-z_]\w*)
+      | (?P<op>=>|::|\+\+|--|&&|\|\||[{}()\[\];,.<>=+\-*/%!?:&|^~@$])
+    ''', re.VERBOSE | re.DOTALL)
+
+    # Keywords that are rare in prose and paths; 'new', 'is', 'in', 'for', 'this' are deliberately left out
+    KEYWORDS = frozenset({
+        "using", "namespace", "class", "struct", "interface", "enum", "void", "static", "public", "private",
+        "protected", "internal", "readonly", "const", "override", "virtual", "abstract", "sealed", "extern",
+        "unsafe", "fixed", "stackalloc", "sizeof", "typeof", "nameof", "foreach", "return", "var", "null",
+        "bool", "int", "float", "double", "byte", "string", "delegate", "dynamic", "async", "await", "yield"
+    })
+    TYPE_DECL = frozenset({"class", "struct", "interface", "enum", "namespace", "delegate"})
+    NUMERIC_LITERAL = re.compile(r"^\s*[\[{(]?\s*-?\d+(?:\.\d+)?f?(?:\s*,\s*-?\d+(?:\.\d+)?f?)*\s*[\]})]?\s*$")
+
+    @classmethod
+    def score(cls, text):
+        """Confidence in [0, 1] that `text` is C# source."""
+        if cls.NUMERIC_LITERAL.match(text): return 0.0 # '{1, 0.5, 0, 1}' colours and vectors
+
+        tokens = [(m.lastgroup, m.group()) for m in cls.TOKEN.finditer(text)]
+        keywords = semicolons = braces = calls = 0
+        declarations = 0
+        depth, balanced = 0, True
+        for i, (kind, value) in enumerate(tokens):
+            if kind == "ident":
+                if value in cls.KEYWORDS: keywords += 1
+                nxt = tokens[i + 1] if i + 1 < len(tokens) else (None, "")
+                # 'class Foo', 'namespace A.B', 'using A.B;'
+                if value in cls.TYPE_DECL and nxt[0] == "ident": declarations += 1
+                elif value == "using" and nxt[0] == "ident" and cls._ends_statement(tokens, i + 1): declarations += 1
+                # 'Type Name(...) {' / 'Type Name(...) =>' method declarations
+                elif nxt[1] == "(" and i > 0 and tokens[i - 1][0] == "ident" and tokens[i - 1][1] not in ("return", "new"):
+                    close = cls._closing_paren(tokens, i + 1)
+                    if close is not None and close + 1 < len(tokens) and tokens[close + 1][1] in ("{", "=>"):
+                        declarations += 1
+                    else:
+                        calls += 1
+                elif nxt[1] == "(":
+                    calls += 1
+            elif kind == "op":
+                if value == ";": semicolons += 1
+                elif value == "{":
+                    braces += 1
+                    depth += 1
+                elif value == "}":
+                    braces += 1
+                    depth -= 1
+                    if depth < 0: balanced = False
+
+        score = 0.5 * min(1, declarations)
+        score += min(0.3, 0.1 * keywords)
+        score += min(0.3, 0.15 * semicolons)
+        score += min(0.2, 0.1 * calls)
+        if braces >= 2 and balanced and depth == 0: score += 0.1
+        return min(1.0, score)
+
+    @staticmethod
+    def _ends_statement(tokens, start):
+        for kind, value in tokens[start:start + 16]:
+            if value == ";": return True
+            if kind != "ident" and value not in (".", "=", "::"): return False
+        return False
+
+    @staticmethod
+    def _closing_paren(tokens, start):
+        depth = 0
+        for j in range(start, min(len(tokens), start + 256)):
+            if tokens[j][1] == "(": depth += 1
+            elif tokens[j][1] == ")":
+                depth -= 1
+                if depth == 0: return j
+        return None
+
+    @classmethod
+    def is_csharp(cls, text):
+        return cls.score(text) >= cls.THRESHOLD
+
+    @classmethod
+    def candidates(cls, value, _depth=0):
+        """The fragments of a string parameter that need a compiler audit (possibly none)."""
+        if not isinstance(value, str) or not any(h in value for h in cls.CODE_HINTS): return []
+        stripped = value.strip()
+        if stripped[:1] in ("{", "[") and _depth < 8:
+            try:
+                parsed = json.loads(stripped)
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, (dict, list)):
+                found = []
+                for leaf in cls._string_leaves(parsed):
+                    found.extend(cls.candidates(leaf, _depth + 1))
+                return found
+        return [value] if cls.is_csharp(value) else []
+
+    @classmethod
+    def _string_leaves(cls, node):
+        if isinstance(node, str):
+            yield node
+        elif isinstance(node, dict):
+            for k, v in node.items():
+                yield from cls._string_leaves(k)
+                yield from cls._string_leaves(v)
+        elif isinstance(node, list):
+            for v in node:
+                yield from cls._string_leaves(v)
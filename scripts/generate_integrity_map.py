@@ -1,37 +1,19 @@
 #!/usr/bin/env python3
-import hashlib
 import os
 import json
 import sys
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from merkle_tree import MerkleTree, hash_file
+
 # UnityVibeBridge: Integrity Map Generator
 # Generates a mapping between Source Code (AST) and Compiled Binary (DLL).
-
-def calculate_folder_hash(directory):
-    sha256 = hashlib.sha256()
-    for root, dirs, files in os.walk(directory):
-        for names in sorted(files):
-            if names.endswith(".cs"):
-                filepath = os.path.join(root, names)
-                with open(filepath, 'rb') as f:
-                    while True:
-                        data = f.read(65536)
-                        if not data:
-                            break
-                        sha256.update(data)
-    return sha256.hexdigest()
+# The source side is stored as a Merkle tree so the Sentinel can name drifted files.
 
 def calculate_file_hash(filepath):
     if not os.path.exists(filepath):
         return None
-    sha256 = hashlib.sha256()
-    with open(filepath, 'rb') as f:
-        while True:
-            data = f.read(65536)
-            if not data:
-                break
-            sha256.update(data)
-    return sha256.hexdigest()
+    return hash_file(filepath)
 
 def generate_map(project_root):
     scripts_dir = os.path.join(project_root, "unity-package/Scripts")
@@ -44,7 +26,8 @@ def generate_map(project_root):
         os.path.join(project_root, "unity-package/Plugins/UnityVibeBridge.Kernel.dll")
     ]
     
-    source_hash = calculate_folder_hash(scripts_dir)
+    source_tree = MerkleTree().build(scripts_dir)
+    source_hash = source_tree["root"]
     dll_hash = None
     active_dll_path = None
 
@@ -63,7 +46,8 @@ def generate_map(project_root):
         "source_hash": source_hash,
         "binary_hash": dll_hash,
         "path": active_dll_path,
-        "timestamp": os.path.getmtime(active_dll_path) if active_dll_path else None
+        "timestamp": os.path.getmtime(active_dll_path) if active_dll_path else None,
+        "source_tree": source_tree
     }
 
     output_path = os.path.join(project_root, "metadata/vibe_integrity.json")
@@ -73,7 +57,7 @@ def generate_map(project_root):
         json.dump(integrity_data, f, indent=4)
     
     print(f"Integrity Map Generated:")
-    print(f"  Source: {source_hash}")
+    print(f"  Source: {source_hash} ({len(source_tree['files'])} files)")
     print(f"  Binary: {dll_hash}")
     print(f"  Saved to: {output_path}")
 
@@ -0,0 +1,201 @@
+import os
+import re
+import json
+import time
+import hashlib
+
+from roslyn_server import RoslynServerError
+from verdict_cache import VerdictCache
+
+DEFAULT_PROJECT = "Assembly-CSharp-Editor"
+ERROR_LOCATION = re.compile(r"^(.*?)\(\d+,\d+\): error")
+
+def split_by_file(errors):
+    """Groups 'path(line,col): error CS....' lines by path."""
+    files = {}
+    for e in errors:
+        m = ERROR_LOCATION.match(e)
+        files.setdefault(m.group(1) if m else "", []).append(e)
+    return files
+
+class IncrementalAssemblyAudit:
+    """
+    UnityVibeBridge: Incremental package audit for SecurityGate.audit_assembly.
+    Sources are split along .asmdef boundaries into projects. Each project's
+    per-file sha256 and last result are kept in `state_file`; a project is only
+    re-audited when one of its files (or a project it references) changed.
+    On the warm Roslyn worker only the edited files are re-parsed; without it
+    the changed package is compiled cold, once.
+    """
+    FORMAT = 1
+
+    def __init__(self, gate, state_file):
+        self.gate = gate
+        self.state_file = state_file
+        self._sent = {} # project -> hashes the warm worker currently holds
+
+    # --- DISCOVERY ---
+
+    def discover(self, package_path):
+        """Returns {project: {"references": [...], "files": [...]}} in dependency order."""
+        asmdefs = {} # directory -> (name, references)
+        for root, dirs, files in os.walk(package_path):
+            if "Tests" in dirs: dirs.remove("Tests")
+            for f in files:
+                if not f.endswith(".asmdef"): continue
+                try:
+                    with open(os.path.join(root, f), "r") as fh: spec = json.load(fh)
+                except (OSError, ValueError):
+                    continue
+                asmdefs[os.path.abspath(root)] = (spec.get("name") or f[:-7], spec.get("references", []))
+
+        projects = {}
+        for path in self.gate._package_sources(package_path):
+            path = os.path.abspath(path)
+            # The nearest .asmdef above a file owns it
+            current, owner = os.path.dirname(path), None
+            while True:
+                if current in asmdefs:
+                    owner = asmdefs[current]
+                    break
+                parent = os.path.dirname(current)
+                if parent == current: break
+                current = parent
+            name, refs = owner if owner else (DEFAULT_PROJECT, [n for n, _ in asmdefs.values()])
+            projects.setdefault(name, {"references": refs, "files": []})["files"].append(path)
+
+        # Only references to other projects in the package matter; externals come from ScriptAssemblies
+        for p in projects.values():
+            p["references"] = [r for r in p["references"] if r in projects]
+        return {name: projects[name] for name in self._order(projects)}
+
+    @staticmethod
+    def _order(projects):
+        ordered, visiting = [], set()
+        def visit(name):
+            if name in ordered or name in visiting: return # Cycles are Unity's error to report
+            visiting.add(name)
+            for r in projects[name]["references"]: visit(r)
+            ordered.append(name)
+        for name in sorted(projects): visit(name)
+        return ordered
+
+    # --- STATE ---
+
+    def _load_state(self, fingerprint, gate_version):
+        try:
+            if self.state_file is None: raise OSError
+            with open(self.state_file, "r") as f: state = json.load(f)
+            if state.get("format") == self.FORMAT and state.get("fingerprint") == fingerprint \
+                    and state.get("gate") == gate_version:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"format": self.FORMAT, "fingerprint": fingerprint, "gate": gate_version, "projects": {}}
+
+    def _save_state(self, state):
+        if self.state_file is None: return
+        # Environment and worker failures are reported for this run but never replayed as a cached result
+        projects = {name: p for name, p in state["projects"].items()
+                    if not any(str(e).startswith(VerdictCache.TRANSIENT_PREFIXES) for e in p["result"]["errors"])}
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            tmp = f"{self.state_file}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f: json.dump(dict(state, projects=projects), f)
+            os.replace(tmp, self.state_file)
+        except OSError:
+            pass
+
+    # --- AUDIT ---
+
+    def run(self, package_path):
+        fingerprint = self.gate.reference_fingerprint()
+        state = self._load_state(fingerprint, self.gate.gate_version())
+        projects = self.discover(package_path)
+        if not projects:
+            return {"errors": ["Security Error: No source files found for audit in " + package_path],
+                    "files": {}, "projects": {}}
+
+        sources, hashes = {}, {}
+        for p in projects.values():
+            for path in p["files"]:
+                with open(path, "rb") as f: raw = f.read()
+                sources[path] = raw.decode("utf-8", "replace")
+                hashes[path] = hashlib.sha256(raw).hexdigest()
+
+        stale = set()
+        for name, p in projects.items():
+            prev = state["projects"].get(name)
+            current = {path: hashes[path] for path in p["files"]}
+            if prev is None or prev.get("files") != current or any(r in stale for r in p["references"]):
+                stale.add(name)
+
+        report = {"errors": [], "files": {}, "projects": {}}
+        if stale:
+            self._audit(projects, stale, sources, hashes, state, fingerprint)
+            self._save_state(state)
+
+        for name, p in projects.items():
+            entry = state["projects"][name]
+            report["projects"][name] = {"status": "compiled" if name in stale else "cached",
+                                        "files": len(p["files"]), "elapsed_ms": entry.get("elapsed_ms", 0.0)}
+            report["errors"].extend(entry["result"]["errors"])
+            for path, errors in entry["result"]["files"].items():
+                report["files"].setdefault(path, []).extend(errors)
+        return report
+
+    def _audit(self, projects, stale, sources, hashes, state, fingerprint):
+        server = None
+        if self.gate.USE_COMPILE_SERVER:
+            try: server = self.gate.get_compile_server(fingerprint)
+            except RoslynServerError: server = None
+        if server is not None:
+            try:
+                for name in projects:
+                    if name in stale:
+                        state["projects"][name] = self._audit_warm(server, name, projects, sources, hashes)
+                return
+            except RoslynServerError:
+                pass
+
+        # Cold fallback: the original single csc run over the whole package, attributed per file
+        start = time.time()
+        errors = self.gate._compile_files([path for p in projects.values() for path in p["files"]])
+        by_file = split_by_file(errors)
+        elapsed_ms = round((time.time() - start) * 1000, 3)
+        unlocated = by_file.pop("", [])
+        for name in projects:
+            if name not in stale: continue
+            if unlocated: by_file[projects[name]["files"][0]] = unlocated + by_file.get(projects[name]["files"][0], [])
+            unlocated = []
+            mine = set(projects[name]["files"])
+            result = {"errors": [e for path, errs in by_file.items() if path in mine for e in errs],
+                      "files": {path: errs for path, errs in by_file.items() if path in mine}}
+            state["projects"][name] = {"files": {p: hashes[p] for p in mine}, "result": result, "elapsed_ms": elapsed_ms}
+
+    def _audit_warm(self, server, name, projects, sources, hashes):
+        p = projects[name]
+        # A freshly (re)started worker has lost its compilations; reload the referenced projects first
+        for dep in p["references"]:
+            if not server.is_loaded(dep): self._send(server, dep, projects, sources, hashes)
+        start = time.time()
+        result = self._send(server, name, projects, sources, hashes)
+        return {"files": {path: hashes[path] for path in p["files"]}, "result": result,
+                "elapsed_ms": round((time.time() - start) * 1000, 3)}
+
+    def _send(self, server, name, projects, sources, hashes):
+        p = projects[name]
+        current = {path: hashes[path] for path in p["files"]}
+        held = self._sent.get(name) if server.is_loaded(name) else None
+        files = {path: sources[path] for path in p["files"]}
+        if held is None:
+            result = server.check_project(name, files, references=p["references"])
+        else:
+            changed = [path for path, h in current.items() if held.get(path) != h]
+            removed = [path for path in held if path not in current]
+            result = server.check_project(name, files, changed, removed, p["references"])
+        if any(e.startswith("Compile Server Error") for e in result["errors"]):
+            self._sent.pop(name, None)
+            raise RoslynServerError(result["errors"][0]) # Never persist a worker failure as a verdict
+        self._sent[name] = current
+        return result
@@ -0,0 +1,78 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+def hash_file(filepath):
+    sha256 = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        while True:
+            data = f.read(65536)
+            if not data: break
+            sha256.update(data)
+    return sha256.hexdigest()
+
+class MerkleTree:
+    """
+    UnityVibeBridge: Merkle manifest of a source tree.
+    Leaves are per-file sha256 digests (hashed on a thread pool; hashlib releases
+    the GIL on large reads); each directory hashes the sorted names, kinds and
+    hashes of its children. Two trees can then be diffed file by file, and an
+    unchanged root proves nothing below it drifted.
+    """
+    def __init__(self, hash_file=hash_file, suffix=".cs", max_workers=None):
+        self.hash_file = hash_file
+        self.suffix = suffix
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+    def build(self, directory):
+        """Returns {"root": hash, "dirs": {rel: hash}, "files": {rel: hash}} (paths use '/')."""
+        paths = []
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(self.suffix): paths.append(os.path.join(root, name))
+
+        if len(paths) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths)), thread_name_prefix="vibe-merkle") as pool:
+                hashes = list(pool.map(self.hash_file, paths))
+        else:
+            hashes = [self.hash_file(p) for p in paths]
+
+        files = {os.path.relpath(p, directory).replace(os.sep, "/"): h for p, h in zip(paths, hashes)}
+        dirs = self.fold(files)
+        return {"root": dirs[""], "dirs": dirs, "files": files}
+
+    @staticmethod
+    def fold(files):
+        """Directory hashes from file hashes, deepest directories first."""
+        children = {"": {}}
+        for rel, digest in files.items():
+            parent, _, name = rel.rpartition("/")
+            children.setdefault(parent, {})[name] = ("f", digest)
+            while parent:
+                parent = parent.rpartition("/")[0]
+                children.setdefault(parent, {})
+
+        dirs = {}
+        for d in sorted(children, key=lambda d: d.count("/") + bool(d), reverse=True):
+            sha256 = hashlib.sha256()
+            for name in sorted(children[d]):
+                kind, digest = children[d][name]
+                sha256.update(f"{kind} {name} {digest}\n".encode())
+            dirs[d] = sha256.hexdigest()
+            if d:
+                parent, _, name = d.rpartition("/")
+                children[parent][name] = ("d", dirs[d])
+        return dirs
+
+    @staticmethod
+    def diff(old, new):
+        """Per-file drift between two trees: {"added": [...], "removed": [...], "modified": [...]}."""
+        drift = {"added": [], "removed": [], "modified": []}
+        if old.get("root") == new.get("root"): return drift
+        old_files, new_files = old.get("files", {}), new.get("files", {})
+        for rel in sorted(set(old_files) | set(new_files)):
+            if rel not in old_files: drift["added"].append(rel)
+            elif rel not in new_files: drift["removed"].append(rel)
+            elif old_files[rel] != new_files[rel]: drift["modified"].append(rel)
+        return drift
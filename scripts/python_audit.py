@@ -0,0 +1,128 @@
+import ast
+from collections import deque
+
+class PythonAuditVisitor(ast.NodeVisitor):
+    """
+    UnityVibeBridge: Single-pass AST auditor behind SecurityGate.check_python.
+    Nodes are visited once, breadth-first (the order ast.walk used, so reports
+    keep their order), and dispatched by exact node type through a table built
+    once per class; node types without a rule cost one dict lookup.
+    """
+    MAX_NODES = 5000
+
+    def __init__(self, gate):
+        # The gate's tables are read live: they can be extended at runtime
+        self.modules = gate.PYTHON_FORBIDDEN_MODULES
+        self.functions = gate.PYTHON_FORBIDDEN_FUNCTIONS
+        self.attributes = gate.PYTHON_FORBIDDEN_ATTRIBUTES
+        self.allowed_hosts = gate.ALLOWED_HOSTS
+        self.issues = []
+
+    def audit(self, tree):
+        """Returns the issues for `tree`, or only the complexity violation if it has too many nodes."""
+        dispatch, issues, AST, leaves = self._DISPATCH, self.issues, ast.AST, self._LEAVES
+        queue = deque([tree])
+        pop, push = queue.popleft, queue.append
+        count = 0
+        while queue:
+            node = pop()
+            count += 1
+            rule = dispatch.get(node.__class__)
+            if rule is not None: rule(self, node)
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if isinstance(value, AST):
+                    # Load/Store/operator singletons carry no rule; count them without queueing
+                    if value.__class__ in leaves: count += 1
+                    else: push(value)
+                elif isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, AST):
+                            if item.__class__ in leaves: count += 1
+                            else: push(item)
+            if count > self.MAX_NODES:
+                return ["Security Violation: File too complex to safely audit."]
+        return issues
+
+    def visit(self, node):
+        return self.audit(node)
+
+    # --- RULES ---
+
+    def visit_Assign(self, node):
+        # 1. Alias Detection
+        value = node.value
+        if isinstance(value, ast.Name) and value.id in self.functions:
+            self.issues.append(f"Python Violation: Attempt to alias forbidden function '{value.id}'")
+        if isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == "getattr":
+            self.issues.append("Python Violation: Attempt to alias via 'getattr' is forbidden.")
+
+    def visit_Import(self, node):
+        for alias in node.names: self._check_module(alias.name)
+
+    def visit_ImportFrom(self, node):
+        self._check_module(node.module)
+
+    def _check_module(self, name):
+        mod_base = name.split('.')[0] if name else ""
+        if mod_base in self.modules:
+            self.issues.append(f"Security Violation: Forbidden module import '{name}'")
+
+    def visit_Call(self, node):
+        func = node.func
+        func_name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else ""
+
+        if func_name in self.functions:
+            self.issues.append(f"Security Violation: Use of forbidden function '{func_name}'")
+
+        # Network & Bridge Check
+        if func_name in ('get', 'post', 'request'):
+            url = self._get_url_from_call(node)
+            if url:
+                if "8085" in url or "localhost" in url or "127.0.0.1" in url:
+                    if not self._has_vibe_token(node):
+                        self.issues.append("Security Violation: Local Unity requests MUST include 'X-Vibe-Token' header.")
+                elif not any(host in url for host in self.allowed_hosts):
+                    self.issues.append(f"Security Violation: External network request to '{url}' blocked.")
+
+        # File System Safety Check (no safe_zones here, so only obvious traversal is blocked)
+        elif func_name in ('open', 'write', 'Path', 'mkdir', 'remove', 'rmdir'):
+            for arg in node.args:
+                if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and ".." in arg.value:
+                    self.issues.append(f"Security Violation: Path traversal '..' detected in '{arg.value}'.")
+
+    def visit_Attribute(self, node):
+        if node.attr in self.attributes:
+            self.issues.append(f"Security Violation: Access to internal attribute '{node.attr}' forbidden.")
+
+    _DISPATCH = {
+        ast.Assign: visit_Assign,
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+        ast.Call: visit_Call,
+        ast.Attribute: visit_Attribute,
+    }
+
+    _LEAVES = frozenset(c for base in (ast.expr_context, ast.boolop, ast.operator, ast.unaryop, ast.cmpop)
+                        for c in base.__subclasses__())
+
+    # --- HELPERS ---
+
+    @staticmethod
+    def _get_url_from_call(node):
+        for arg in node.args:
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and "http" in arg.value:
+                return arg.value
+        for kw in node.keywords:
+            if kw.arg == 'url' and isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str):
+                return kw.value.value
+        return None
+
+    @staticmethod
+    def _has_vibe_token(node):
+        for kw in node.keywords:
+            if kw.arg == 'headers' and isinstance(kw.value, ast.Dict):
+                for k in kw.value.keys:
+                    if isinstance(k, ast.Constant) and k.value == "X-Vibe-Token":
+                        return True
+        return False
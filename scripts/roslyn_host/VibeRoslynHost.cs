@@ -0,0 +1,140 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Reflection;
+using System.Text.Json;
+using Microsoft.CodeAnalysis;
+using Microsoft.CodeAnalysis.CSharp;
+
+namespace UnityVibeBridge.Audit {
+    // Long-lived Roslyn host for SecurityGate.check_csharp (see scripts/roslyn_server.py).
+    // Loads the Unity reference set once and answers audits over stdin/stdout:
+    //   args:     <roslynDir> <refsFile>   (refsFile = one reference path per line)
+    //   ready:    {"ready":true,"references":N}
+    //   request:  {"id":"...","code":"..."}
+    //   response: {"id":"...","errors":["GeneratedTool.cs(3,5): error CS1002: ; expected", ...]}
+    // Incremental package audits keep one compilation per project (asmdef) between requests:
+    //   request:  {"id":"...","project":"Name","reset":false,"files":{"path":"text"},"removed":["path"],"references":["OtherProject"]}
+    //   response: {"id":"...","errors":[...],"files":{"path":["..."]}}
+    public static class VibeRoslynHost {
+        private static string _roslynDir;
+
+        public static int Main(string[] args) {
+            _roslynDir = args[0];
+            // Roslyn lives next to Unity's csc.dll, not in the app folder
+            AppDomain.CurrentDomain.AssemblyResolve += (s, e) => {
+                string p = Path.Combine(_roslynDir, new AssemblyName(e.Name).Name + ".dll");
+                return File.Exists(p) ? Assembly.LoadFrom(p) : null;
+            };
+            return Server.Run(File.ReadAllLines(args[1]));
+        }
+    }
+
+    internal static class Server {
+        private static List<MetadataReference> _refs;
+        private static CSharpCompilationOptions _options;
+        private static CSharpParseOptions _parseOptions;
+        private static readonly Dictionary<string, CSharpCompilation> _projects = new Dictionary<string, CSharpCompilation>();
+
+        public static int Run(string[] refPaths) {
+            _refs = refPaths.Where(File.Exists)
+                .Select(p => (MetadataReference)MetadataReference.CreateFromFile(p)).ToList();
+            // Mirrors the csc flags in SecurityGate.audit_assembly (-nowarn:1701,1702,CS0067,CS0414 -define:UNITY_EDITOR)
+            var suppressed = new Dictionary<string, ReportDiagnostic> {
+                { "CS1701", ReportDiagnostic.Suppress }, { "CS1702", ReportDiagnostic.Suppress },
+                { "CS0067", ReportDiagnostic.Suppress }, { "CS0414", ReportDiagnostic.Suppress }
+            };
+            _options = new CSharpCompilationOptions(OutputKind.DynamicallyLinkedLibrary)
+                .WithSpecificDiagnosticOptions(suppressed);
+            _parseOptions = CSharpParseOptions.Default.WithPreprocessorSymbols("UNITY_EDITOR");
+
+            // Warm-up so the JIT and reference metadata are hot before the first real audit
+            Check("public class VibeWarmup { }");
+            Reply(new Dictionary<string, object> { { "ready", true }, { "references", _refs.Count } });
+
+            string line;
+            while ((line = Console.In.ReadLine()) != null) {
+                string id = "";
+                var reply = new Dictionary<string, object>();
+                try {
+                    using (var doc = JsonDocument.Parse(line)) {
+                        var root = doc.RootElement;
+                        id = root.GetProperty("id").GetString();
+                        if (root.TryGetProperty("project", out _)) CheckProject(root, reply);
+                        else reply["errors"] = Check(root.GetProperty("code").GetString());
+                    }
+                } catch (Exception e) {
+                    reply["errors"] = new List<string> { "Compile Server Error: " + e.Message };
+                }
+                reply["id"] = id;
+                Reply(reply);
+            }
+            return 0;
+        }
+
+        // Applies a file delta to the project's cached compilation; unchanged syntax trees are reused.
+        private static void CheckProject(JsonElement root, Dictionary<string, object> reply) {
+            string name = root.GetProperty("project").GetString();
+            bool reset = root.TryGetProperty("reset", out var r) && r.GetBoolean();
+            if (reset || !_projects.TryGetValue(name, out var compilation)) {
+                compilation = CSharpCompilation.Create(name, null, _refs, _options);
+            }
+            var trees = compilation.SyntaxTrees.ToDictionary(t => t.FilePath);
+
+            if (root.TryGetProperty("removed", out var removed)) {
+                foreach (var p in removed.EnumerateArray()) {
+                    if (trees.TryGetValue(p.GetString(), out var old)) {
+                        compilation = compilation.RemoveSyntaxTrees(old);
+                        trees.Remove(p.GetString());
+                    }
+                }
+            }
+            foreach (var f in root.GetProperty("files").EnumerateObject()) {
+                var tree = CSharpSyntaxTree.ParseText(f.Value.GetString(), _parseOptions, f.Name);
+                compilation = trees.TryGetValue(f.Name, out var old)
+                    ? compilation.ReplaceSyntaxTree(old, tree)
+                    : compilation.AddSyntaxTrees(tree);
+            }
+
+            // Other asmdef projects are referenced in-memory, without emitting their dlls
+            var refs = new List<MetadataReference>(_refs);
+            if (root.TryGetProperty("references", out var deps)) {
+                foreach (var d in deps.EnumerateArray()) {
+                    if (_projects.TryGetValue(d.GetString(), out var dep)) refs.Add(dep.ToMetadataReference());
+                }
+            }
+            compilation = compilation.WithReferences(refs);
+            _projects[name] = compilation;
+
+            var errors = new List<string>();
+            var files = new Dictionary<string, List<string>>();
+            foreach (var d in Errors(compilation)) {
+                string text = d.ToString();
+                string path = d.Location.SourceTree?.FilePath ?? "";
+                errors.Add(text);
+                if (!files.TryGetValue(path, out var list)) files[path] = list = new List<string>();
+                list.Add(text);
+            }
+            reply["errors"] = errors;
+            reply["files"] = files;
+        }
+
+        private static List<string> Check(string code) {
+            var tree = CSharpSyntaxTree.ParseText(code, _parseOptions, "GeneratedTool.cs");
+            var compilation = CSharpCompilation.Create("AuditOutput", new[] { tree }, _refs, _options);
+            return Errors(compilation).Select(d => d.ToString()).ToList();
+        }
+
+        private static IEnumerable<Diagnostic> Errors(CSharpCompilation compilation) {
+            // CS0433 is expected: Unity shells and modules overlap by design (see audit_assembly)
+            return compilation.GetDiagnostics()
+                .Where(d => d.Severity == DiagnosticSeverity.Error && d.Id != "CS0433");
+        }
+
+        private static void Reply(Dictionary<string, object> obj) {
+            Console.Out.WriteLine(JsonSerializer.Serialize(obj));
+            Console.Out.Flush();
+        }
+    }
+}
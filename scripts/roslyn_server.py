@@ -0,0 +1,251 @@
+import os
+import glob
+import json
+import time
+import uuid
+import queue
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+
+from user_state import private_dir
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+class RoslynServerError(Exception):
+    pass
+
+class RoslynTimeout(RoslynServerError):
+    """A request outlived its timeout; the input is not retried (it would likely time out again)."""
+
+def _sha256_file(path):
+    with open(path, "rb") as f: return hashlib.sha256(f.read()).hexdigest()
+
+class RoslynCompileServer:
+    """
+    UnityVibeBridge: Warm Roslyn worker for SecurityGate.check_csharp.
+    Builds scripts/roslyn_host/VibeRoslynHost.cs once against Unity's own Roslyn,
+    keeps it running with the Unity reference set loaded, and audits snippets over
+    its stdin/stdout. The worker is recycled after `max_requests` audits or when it
+    grows past `max_rss_mb`, and restarted if it crashes or stops answering.
+    The host is built into a per-user 0700 directory and its hash is checked
+    against the build stamp before every launch.
+    """
+    HOST_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roslyn_host", "VibeRoslynHost.cs")
+    RETRY_BUILD_AFTER = 60.0
+
+    def __init__(self, dotnet_bin, csc_dll, references, build_dir=None,
+                 request_timeout=10.0, startup_timeout=60.0, max_requests=500, max_rss_mb=1024):
+        self.dotnet_bin = dotnet_bin
+        self.csc_dll = csc_dll
+        self.roslyn_dir = os.path.dirname(csc_dll)
+        self.references = list(references)
+        if not build_dir:
+            try: build_dir = private_dir("roslyn_host")
+            except OSError: build_dir = tempfile.mkdtemp(prefix="vibe_roslyn_host_") # Private too; rebuilt per process
+        self.build_dir = build_dir
+        self.request_timeout = request_timeout
+        self.startup_timeout = startup_timeout
+        self.max_requests = max_requests
+        self.max_rss_mb = max_rss_mb
+        self._proc = None
+        self._lines = None
+        self._loaded = set()
+        self._lock = threading.Lock()
+        self._served = 0 # audits answered by the current worker
+        self._broken_until = 0.0
+        self.last_error = None
+        self.fingerprint = "" # Reference-set fingerprint this worker was started for
+        self.stats = {"requests": 0, "starts": 0, "restarts": 0, "recycles": 0, "timeouts": 0,
+                      "builds": 0, "total_ms": 0.0, "last_ms": 0.0}
+
+    # --- BUILD ---
+
+    def _runtime_dir(self):
+        """Newest Microsoft.NETCore.App shipped with the editor's NetCoreRuntime."""
+        versions = glob.glob(os.path.join(os.path.dirname(self.dotnet_bin), "shared", "Microsoft.NETCore.App", "*"))
+        if not versions:
+            raise RoslynServerError("NetCoreRuntime shared framework not found next to " + self.dotnet_bin)
+        return sorted(versions, key=lambda v: [int(p) if p.isdigit() else p for p in os.path.basename(v).split(".")])[-1]
+
+    def _build(self):
+        """Compiles the host once per (source, Roslyn build). Returns the host dll path."""
+        with open(self.HOST_SOURCE, "rb") as f: source = f.read()
+        stamp = hashlib.sha256(source + self.csc_dll.encode() + str(os.path.getmtime(self.csc_dll)).encode()).hexdigest()
+        host_dll = os.path.join(self.build_dir, "VibeRoslynHost.dll")
+        stamp_file = os.path.join(self.build_dir, "build.stamp")
+        try: # "<stamp> <sha256 of the dll>": a host replaced after the build is rebuilt, never run
+            with open(stamp_file, "r") as f: recorded = f.read().split()
+            if recorded[0] == stamp and recorded[1] == _sha256_file(host_dll): return host_dll
+        except (OSError, IndexError): pass
+
+        os.makedirs(self.build_dir, mode=0o700, exist_ok=True)
+        runtime_dir = self._runtime_dir()
+        framework = [p for p in glob.glob(os.path.join(runtime_dir, "*.dll"))
+                     if os.path.basename(p).startswith(("System.", "Microsoft.", "netstandard", "mscorlib"))]
+        cmd = [self.dotnet_bin, self.csc_dll, "-target:exe", "-nologo", "-nostdlib", f"-out:{host_dll}",
+               f"-r:{os.path.join(self.roslyn_dir, 'Microsoft.CodeAnalysis.dll')}",
+               f"-r:{os.path.join(self.roslyn_dir, 'Microsoft.CodeAnalysis.CSharp.dll')}"]
+        cmd += [f"-r:{p}" for p in framework]
+        cmd.append(self.HOST_SOURCE)
+        process = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        if process.returncode != 0:
+            errors = [l.strip() for l in process.stdout.splitlines() if "error" in l]
+            raise RoslynServerError("Roslyn host build failed: " + "; ".join(errors[:5]))
+
+        # Run on the same shared framework as csc itself
+        runtime_config = os.path.join(self.roslyn_dir, "csc.runtimeconfig.json")
+        host_config = os.path.join(self.build_dir, "VibeRoslynHost.runtimeconfig.json")
+        if os.path.exists(runtime_config):
+            shutil.copyfile(runtime_config, host_config)
+        else:
+            with open(host_config, "w") as f:
+                json.dump({"runtimeOptions": {"framework": {"name": "Microsoft.NETCore.App",
+                                                            "version": os.path.basename(runtime_dir)}}}, f)
+        with open(stamp_file, "w") as f: f.write(f"{stamp} {_sha256_file(host_dll)}")
+        self.stats["builds"] += 1
+        return host_dll
+
+    # --- WORKER LIFECYCLE ---
+
+    def _start(self):
+        host_dll = self._build()
+        refs_file = os.path.join(self.build_dir, f"refs_{os.getpid()}.txt")
+        with open(refs_file, "w") as f: f.write("\n".join(self.references))
+
+        self._proc = subprocess.Popen([self.dotnet_bin, host_dll, self.roslyn_dir, refs_file],
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      text=True, encoding="utf-8", bufsize=1)
+        self._lines = queue.Queue()
+        self._loaded = set() # Projects whose compilation lives in this worker
+        threading.Thread(target=self._pump, args=(self._proc, self._lines), name="VibeRoslynReader", daemon=True).start()
+        self._served = 0
+        self.stats["starts"] += 1
+
+        ready = self._read(self.startup_timeout)
+        if not ready.get("ready"):
+            self._kill()
+            raise RoslynServerError("Roslyn host did not report ready.")
+
+    @staticmethod
+    def _pump(proc, lines):
+        for line in proc.stdout: lines.put(line)
+        lines.put(None) # EOF: worker exited
+
+    def _read(self, timeout):
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            self.stats["timeouts"] += 1
+            self._kill()
+            raise RoslynTimeout(f"Roslyn host did not answer within {timeout}s.")
+        if line is None:
+            self._kill()
+            raise RoslynServerError("Roslyn host exited.")
+        return json.loads(line)
+
+    def _kill(self):
+        self._loaded = set()
+        proc, self._proc = self._proc, None
+        if proc is None: return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except: pass
+
+    def _recycle_due(self):
+        if self._served >= self.max_requests: return True
+        if psutil and self.max_rss_mb:
+            try: return psutil.Process(self._proc.pid).memory_info().rss > self.max_rss_mb * 1024 * 1024
+            except: return False
+        return False
+
+    def _ensure_running(self):
+        if self._proc is not None and self._proc.poll() is None:
+            if not self._recycle_due(): return
+            self.stats["recycles"] += 1
+            self._kill()
+        elif self._proc is not None:
+            self.stats["restarts"] += 1 # Crashed between requests
+            self._proc = None
+        if time.time() < self._broken_until:
+            raise RoslynServerError(self.last_error or "Roslyn host unavailable.")
+        try:
+            self._start()
+        except (RoslynServerError, OSError, subprocess.SubprocessError, ValueError) as e:
+            # Don't rebuild on every audit when the toolchain is missing or broken
+            self.last_error = str(e)
+            self._broken_until = time.time() + self.RETRY_BUILD_AFTER
+            raise RoslynServerError(self.last_error)
+
+    # --- API ---
+
+    def check(self, code):
+        """Returns the compiler errors for `code` (empty list if it compiles). Raises RoslynServerError if unavailable."""
+        return self._call(lambda: {"code": code}, self.request_timeout).get("errors", [])
+
+    def check_project(self, name, files, changed=None, removed=(), references=(), timeout=120.0):
+        """
+        Incrementally audits one package project (asmdef). `files` maps path -> source; only
+        `changed` paths are sent if the worker already holds the project, otherwise all of them.
+        Returns {"errors": [...], "files": {path: [...]}}.
+        """
+        def build():
+            if name in self._loaded and changed is not None:
+                return {"project": name, "files": {p: files[p] for p in changed},
+                        "removed": list(removed), "references": list(references)}
+            return {"project": name, "reset": True, "files": files, "references": list(references)}
+
+        reply = self._call(build, timeout)
+        with self._lock: self._loaded.add(name)
+        return {"errors": reply.get("errors", []), "files": reply.get("files", {})}
+
+    def is_loaded(self, name):
+        with self._lock: return name in self._loaded and self._proc is not None
+
+    def _call(self, build, timeout):
+        """
+        Sends one request (payload built after the worker is known to be up) and returns the reply.
+        Requests are serialized: the host answers one at a time over a single pipe.
+        """
+        with self._lock:
+            start = time.time()
+            for attempt in (0, 1):
+                self._ensure_running()
+                cmd_id = str(uuid.uuid4())
+                try:
+                    self._proc.stdin.write(json.dumps(dict(build(), id=cmd_id)) + "\n")
+                    self._proc.stdin.flush()
+                    reply = self._read(timeout)
+                except RoslynTimeout:
+                    raise # Killed already; the next request starts a fresh worker
+                except (OSError, ValueError, RoslynServerError) as e:
+                    # One restart per audit: a crash mid-request is retried on a fresh worker
+                    self._kill()
+                    self.stats["restarts"] += 1
+                    if attempt: raise RoslynServerError(str(e))
+                    continue
+                if reply.get("id") != cmd_id:
+                    self._kill()
+                    raise RoslynServerError("Roslyn host answered out of order.")
+                self._served += 1
+                elapsed_ms = (time.time() - start) * 1000
+                self.stats["requests"] += 1
+                self.stats["total_ms"] += elapsed_ms
+                self.stats["last_ms"] = round(elapsed_ms, 3)
+                return reply
+
+    def stop(self):
+        with self._lock: self._kill()
+
+    def get_stats(self):
+        with self._lock:
+            requests = self.stats["requests"] or 1
+            return dict(self.stats, running=self._proc is not None and self._proc.poll() is None,
+                        served=self._served, avg_ms=round(self.stats["total_ms"] / requests, 3),
+                        total_ms=round(self.stats["total_ms"], 3), last_error=self.last_error)
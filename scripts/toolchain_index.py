@@ -0,0 +1,157 @@
+import os
+import re
+import glob
+import hmac
+import json
+import hashlib
+import threading
+
+VERSION_PATTERN = re.compile(r"(\d{4})\.(\d+)\.(\d+)([abfpx])(\d+)")
+STAGE_ORDER = {"x": 0, "a": 1, "b": 2, "f": 3, "p": 4}
+
+def version_key(version):
+    """Sort key for Unity versions ('2022.3.22f1' > '2022.3.9f1' > '2022.3.22b1'); unknown versions sort first."""
+    m = VERSION_PATTERN.search(version or "")
+    if not m: return (0, 0, 0, 0, 0)
+    return (int(m.group(1)), int(m.group(2)), int(m.group(3)), STAGE_ORDER[m.group(4)], int(m.group(5)))
+
+def _mtime(path):
+    try: return os.stat(path).st_mtime_ns
+    except OSError: return None
+
+class ToolchainIndex:
+    """
+    UnityVibeBridge: Persisted index of installed Unity editors for the Security Gate.
+    The recursive csc.dll search runs once per install change instead of once per
+    process: each editor's csc, dotnet, Managed and reference-assembly paths are
+    stored with the mtimes of the directories an install or uninstall would
+    touch, and later processes only re-stat those directories. The index names
+    binaries the gate executes, so it is HMAC-signed under a per-install `secret`
+    (without one nothing is persisted) and must cover every editor it lists.
+    """
+    FORMAT = 2
+
+    def __init__(self, index_file, search_roots, secret=None):
+        self.index_file = index_file if secret else None
+        self.secret = secret
+        self.search_roots = list(search_roots)
+        self._editors = None
+        self._lock = threading.Lock()
+        self.stats = {"index_hits": 0, "scans": 0, "validations": 0, "rejected": 0}
+
+    # --- DISCOVERY ---
+
+    @staticmethod
+    def _describe(csc_dll):
+        """Derives one editor's toolchain paths from its csc.dll."""
+        # csc.dll is usually in Data/DotNetSdkRoslyn/ or similar; find the 'Data' directory.
+        current = os.path.dirname(csc_dll)
+        while current and os.path.basename(current) != "Data" and len(current) > 1:
+            current = os.path.dirname(current)
+        if os.path.basename(current) != "Data":
+            current = os.path.dirname(os.path.dirname(os.path.dirname(csc_dll)))
+        editor_data = current
+
+        m = VERSION_PATTERN.search(csc_dll)
+        return {
+            "version": m.group(0) if m else os.path.basename(os.path.dirname(os.path.dirname(editor_data))) or "unknown",
+            "csc": csc_dll,
+            "dotnet": os.path.join(editor_data, "NetCoreRuntime/dotnet"),
+            "managed": os.path.join(editor_data, "Managed"),
+            "ref_assemblies": os.path.join(editor_data, "UnityReferenceAssemblies/unity-4.8-api"),
+            "data": editor_data
+        }
+
+    def _watched_dirs(self, editors):
+        """Directories whose mtime changes when an editor is added, removed or updated in place."""
+        dirs = set(self.search_roots)
+        for e in editors:
+            install = os.path.dirname(os.path.dirname(e["data"])) # .../<version>/Editor/Data -> .../<version>
+            dirs.update([os.path.dirname(install), install, e["data"], os.path.dirname(e["csc"])])
+        return sorted(dirs)
+
+    def scan(self):
+        """Full (slow) search of every root; rewrites the index."""
+        editors = []
+        for root in self.search_roots:
+            if not os.path.exists(root): continue
+            for csc in sorted(glob.glob(os.path.join(root, "**/DotNetSdkRoslyn/csc.dll"), recursive=True)):
+                editor = self._describe(os.path.abspath(csc))
+                if not any(e["csc"] == editor["csc"] for e in editors): editors.append(editor)
+        self.stats["scans"] += 1
+        self._save(editors)
+        return editors
+
+    # --- PERSISTENCE ---
+
+    def _mac(self, index):
+        body = json.dumps({k: v for k, v in index.items() if k != "mac"}, sort_keys=True).encode()
+        return hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+
+    def _save(self, editors):
+        if self.index_file is None: return
+        index = {
+            "format": self.FORMAT,
+            "search_roots": self.search_roots,
+            "editors": editors,
+            "mtimes": {d: _mtime(d) for d in self._watched_dirs(editors)}
+        }
+        index["mac"] = self._mac(index)
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            tmp = f"{self.index_file}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f: json.dump(index, f, indent=2)
+            os.replace(tmp, self.index_file)
+        except OSError:
+            pass
+
+    def _load_valid(self):
+        """Returns the persisted editors if the index is authentic and no watched directory changed since the scan, else None."""
+        if self.index_file is None: return None
+        try:
+            with open(self.index_file, "r") as f: index = json.load(f)
+            editors, mtimes = index["editors"], index["mtimes"]
+            # Signed, and every directory the listed editors depend on is actually watched
+            if not hmac.compare_digest(str(index.get("mac")), self._mac(index)) or \
+               not set(self._watched_dirs(editors)) <= set(mtimes):
+                self.stats["rejected"] += 1
+                return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        self.stats["validations"] += 1
+        if index.get("format") != self.FORMAT or index.get("search_roots") != self.search_roots: return None
+        for d, recorded in mtimes.items():
+            if _mtime(d) != recorded: return None
+        return editors
+
+    # --- API ---
+
+    def editors(self, rescan=False):
+        with self._lock:
+            if self._editors is None or rescan:
+                cached = None if rescan else self._load_valid()
+                if cached is not None:
+                    self.stats["index_hits"] += 1
+                    self._editors = cached
+                else:
+                    self._editors = self.scan()
+            return list(self._editors)
+
+    def select(self, version=None, strict=False):
+        """
+        The editor matching `version` (exact or prefix, e.g. '2022.3'), else the newest one.
+        With strict=True a version that is not installed returns None instead.
+        """
+        editors = self.editors()
+        if version:
+            matches = [e for e in editors if e["version"] == version] or \
+                      [e for e in editors if e["version"].startswith(version)]
+            if matches: return max(matches, key=lambda e: version_key(e["version"]))
+            if strict: return None
+        if not editors: return None
+        return max(editors, key=lambda e: version_key(e["version"]))
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, index_file=self.index_file,
+                        editors=[e["version"] for e in self._editors] if self._editors is not None else None)
@@ -0,0 +1,35 @@
+import os
+import sys
+import secrets
+
+def state_root():
+    """Per-user state directory outside any project workspace (VIBE_STATE_DIR overrides)."""
+    if os.environ.get("VIBE_STATE_DIR"): return os.environ["VIBE_STATE_DIR"]
+    if sys.platform == "win32":
+        return os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "UnityVibeBridge")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "unityvibebridge")
+
+def private_dir(*parts):
+    """
+    Creates (0700) and returns a directory under state_root(). On POSIX it must be
+    owned by the current user; group/other access is stripped, and a directory
+    planted by someone else raises PermissionError.
+    """
+    path = os.path.join(state_root(), *parts)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if os.name == "posix":
+        st = os.stat(path)
+        if st.st_uid != os.getuid(): raise PermissionError(f"{path} is not owned by the current user")
+        if st.st_mode & 0o077: os.chmod(path, 0o700)
+    return path
+
+def secret(name, size=32):
+    """Per-install random key kept in private_dir(), created (0600) on first use."""
+    path = os.path.join(private_dir(), name)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f: f.write(secrets.token_bytes(size))
+    except FileExistsError: pass
+    with open(path, "rb") as f: key = f.read()
+    if len(key) < size: raise PermissionError(f"{path} is truncated")
+    return key
@@ -0,0 +1,120 @@
+import os
+import hmac
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+class VerdictCache:
+    """
+    UnityVibeBridge: Content-addressed store for Security Gate verdicts.
+    A verdict is keyed by sha256(kind, code, gate version, reference fingerprint),
+    so identical snippets are audited once and any change to the gate or to the
+    assemblies it compiles against simply produces new keys. Hot entries live in
+    an in-memory LRU; every verdict is also written to `directory` (None: memory
+    only) so a restart of the MCP server keeps them. On-disk entries carry an
+    HMAC under a per-install `secret`; anything unsigned or forged is a miss.
+    """
+    # Environment problems say nothing about the code; never pin them
+    TRANSIENT_PREFIXES = ("Environment Error", "Compile Server Error")
+
+    def __init__(self, directory, secret=None, max_entries=1024, max_disk_entries=20000):
+        self.directory = directory if secret else None # Never trust disk entries that cannot be authenticated
+        self.secret = secret
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "pruned": 0, "rejected": 0}
+
+    @staticmethod
+    def key(kind, code, gate_version, fingerprint=""):
+        h = hashlib.sha256()
+        for part in (kind, gate_version, fingerprint, code):
+            h.update(part.encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _mac(self, key, issues):
+        body = key.encode() + b"\0" + json.dumps(issues, sort_keys=True).encode()
+        return hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+
+    def get(self, key):
+        """Returns the cached issue list, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return list(self._memory[key])
+        try:
+            if self.directory is None: raise OSError
+            with open(self._path(key), "r") as f: entry = json.load(f)
+            issues = entry["issues"]
+            if not isinstance(issues, list) or not hmac.compare_digest(str(entry.get("mac")), self._mac(key, issues)):
+                with self._lock: self.stats["rejected"] += 1
+                raise ValueError("unauthenticated verdict")
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock: self.stats["misses"] += 1
+            return None
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, issues)
+        return list(issues)
+
+    def cacheable(self, issues):
+        return not any(str(i).startswith(self.TRANSIENT_PREFIXES) for i in issues)
+
+    def put(self, key, issues):
+        issues = list(issues)
+        with self._lock:
+            self._remember(key, issues)
+            self.stats["writes"] += 1
+            self._writes_since_prune += 1
+            prune = self._writes_since_prune >= 256
+            if prune: self._writes_since_prune = 0
+        if self.directory is None: return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w") as f: json.dump({"issues": issues, "mac": self._mac(key, issues)}, f)
+            os.replace(tmp, path) # Atomic: a concurrent reader sees the old verdict or the new one
+        except OSError:
+            pass
+        if prune: self._prune()
+
+    def _remember(self, key, issues):
+        self._memory[key] = issues
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self):
+        """Keeps the on-disk store bounded by dropping the least recently written verdicts."""
+        if self.directory is None: return
+        try:
+            entries = []
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir(): continue
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith(".json"): entries.append((entry.stat().st_mtime, entry.path))
+            excess = len(entries) - self.max_disk_entries
+            if excess <= 0: return
+            for _, path in sorted(entries)[:excess]:
+                try: os.remove(path)
+                except OSError: pass
+            with self._lock: self.stats["pruned"] += excess
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock: self._memory.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, memory_entries=len(self._memory), max_entries=self.max_entries,
+                        directory=self.directory)
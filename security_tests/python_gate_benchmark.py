@@ -0,0 +1,171 @@
+# UnityVibeBridge: The Governed Creation Kernel for Unity
+# Copyright (C) 2026 B-A-M-N
+#
+# This software is dual-licensed under the GNU AGPLv3 and a
+# Commercial "Work-or-Pay" Maintenance Agreement.
+#
+# You may use this file under the terms of the AGPLv3, provided
+# you meet all requirements (including source disclosure).
+#
+# For commercial use, or to keep your modifications private,
+# you must satisfy the requirements of the Commercial Path
+# as defined in the LICENSE file at the project root.
+
+import sys
+import os
+import re
+import ast
+import io
+import glob
+import contextlib
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+from security_gate import SecurityGate
+from python_audit import PythonAuditVisitor
+from pentest_suite import RedTeamSuite
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# --- LEGACY GATE (the ast.walk / isinstance chain this benchmark replaced) ---
+
+def legacy_python(code):
+    try:
+        code.encode('ascii')
+    except UnicodeEncodeError:
+        return ["Security Violation: Non-ASCII characters detected. Potential Homoglyph attack."]
+    if len(code) > 50000:
+        return ["Security Violation: File too large to safely audit."]
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return [f"Syntax Error: {str(e)}"]
+    return legacy_walk(tree)
+
+def legacy_walk(tree):
+    G = SecurityGate
+    issues = []
+    node_count = 0
+    for node in ast.walk(tree):
+        node_count += 1
+        if node_count > 5000:
+            return ["Security Violation: File too complex to safely audit."]
+        if isinstance(node, ast.Assign):
+            if isinstance(node.value, ast.Name) and node.value.id in G.PYTHON_FORBIDDEN_FUNCTIONS:
+                issues.append(f"Python Violation: Attempt to alias forbidden function '{node.value.id}'")
+            if isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name) and node.value.func.id == "getattr":
+                issues.append("Python Violation: Attempt to alias via 'getattr' is forbidden.")
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in (node.names if isinstance(node, ast.Import) else [ast.alias(name=node.module, asname=None)]):
+                mod_base = alias.name.split('.')[0] if alias.name else ""
+                if mod_base in G.PYTHON_FORBIDDEN_MODULES:
+                    issues.append(f"Security Violation: Forbidden module import '{alias.name}'")
+        if isinstance(node, ast.Call):
+            func_name = ""
+            if isinstance(node.func, ast.Name): func_name = node.func.id
+            elif isinstance(node.func, ast.Attribute): func_name = node.func.attr
+            if func_name in G.PYTHON_FORBIDDEN_FUNCTIONS:
+                issues.append(f"Security Violation: Use of forbidden function '{func_name}'")
+            if func_name in ('get', 'post', 'request'):
+                url = legacy_url(node)
+                if url:
+                    if "8085" in url or "localhost" in url or "127.0.0.1" in url:
+                        if not legacy_token(node):
+                            issues.append("Security Violation: Local Unity requests MUST include 'X-Vibe-Token' header.")
+                    elif not any(host in url for host in G.ALLOWED_HOSTS):
+                        issues.append(f"Security Violation: External network request to '{url}' blocked.")
+            if func_name in ('open', 'write', 'Path', 'mkdir', 'remove', 'rmdir'):
+                for arg in node.args:
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and ".." in arg.value:
+                        issues.append(f"Security Violation: Path traversal '..' detected in '{arg.value}'.")
+        if isinstance(node, ast.Attribute):
+            if node.attr in G.PYTHON_FORBIDDEN_ATTRIBUTES:
+                issues.append(f"Security Violation: Access to internal attribute '{node.attr}' forbidden.")
+    return issues
+
+def legacy_url(node):
+    for arg in node.args:
+        if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and "http" in arg.value:
+            return arg.value
+    for kw in node.keywords:
+        if kw.arg == 'url' and isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str):
+            return kw.value.value
+    return None
+
+def legacy_token(node):
+    for kw in node.keywords:
+        if kw.arg == 'headers' and isinstance(kw.value, ast.Dict):
+            for k in kw.value.keys:
+                if isinstance(k, ast.Constant) and k.value == "X-Vibe-Token":
+                    return True
+    return False
+
+def legacy_secrets(value):
+    issues = []
+    for p in [r"sk_[a-zA-Z0-9]{32}", r"AIza[a-zA-Z0-9_-]{35}"]:
+        if re.search(p, value): issues.append("Security Violation: Sensitive pattern detected.")
+    return issues
+
+# --- CORPUS ---
+
+def pentest_vectors():
+    vectors = {"Python": [], "Shell": []}
+    suite = RedTeamSuite()
+    suite.log_test = lambda category, name, code, expected_blocked=True: vectors.get(category, []).append(code)
+    with contextlib.redirect_stdout(io.StringIO()): # Section banners
+        for run in (suite.run_python_tests, suite.run_shell_tests, suite.run_interference_tests,
+                    suite.run_combo_tests, suite.run_multistep_chains):
+            run()
+    return vectors
+
+def benign_scripts(rng):
+    """The repo's own Python plus generated tool scripts just under the gate's node budget."""
+    scripts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "**", "*.py"), recursive=True)):
+        with open(path, "r", encoding="utf-8", errors="replace") as f: scripts.append(f.read())
+    for size in (50, 150, 300):
+        lines = ["import json", "import math", ""]
+        for i in range(size):
+            lines.append(f"def step_{i}(data, scale={rng.random():.3f}):")
+            lines.append(f"    value = math.sqrt(data.get('w{i}', 1) * scale) + len(str(data))")
+            lines.append(f"    return json.dumps({{'step': {i}, 'value': value}})")
+        scripts.append("\n".join(lines))
+    return scripts
+
+def timed(fn, values, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [fn(v) for v in values]
+    return results, (time.perf_counter() - start) * 1e6 / (rounds * max(1, len(values)))
+
+def compare(label, old, new, values, rounds, normalize=lambda r: r):
+    old_results, old_us = timed(old, values, rounds)
+    new_results, new_us = timed(new, values, rounds)
+    mismatches = sum(1 for a, b in zip(old_results, new_results) if normalize(a) != normalize(b))
+    print(f"{label:<28} {len(values):>5}  {old_us:>10.1f}  {new_us:>10.1f}  {old_us / max(new_us, 1e-9):>6.2f}x  {mismatches}")
+    return mismatches
+
+def main():
+    rng = random.Random(11)
+    vectors, benign = pentest_vectors(), benign_scripts(rng)
+    strings = vectors["Python"] + vectors["Shell"] + benign + \
+              ["sk_" + "a" * 32, "key=AIza" + "b" * 35, "plain material name"] * 20
+
+    print("--- Python Gate Benchmark (us/input, old vs new) ---")
+    print(f"{'corpus':<28} {'n':>5}  {'old':>10}  {'new':>10}  {'speedup':>7}  mismatches")
+    bad = compare("pentest python vectors", legacy_python, SecurityGate._audit_python, vectors["Python"], 200)
+    bad += compare("benign scripts", legacy_python, SecurityGate._audit_python, benign, 5)
+    trees = []
+    for code in benign:
+        try: trees.append(ast.parse(code))
+        except SyntaxError: pass
+    bad += compare("benign scripts (walk only)", legacy_walk,
+                   lambda tree: PythonAuditVisitor(SecurityGate).audit(tree), trees, 5)
+    bad += compare("secret scan", legacy_secrets, SecurityGate._check_secrets, strings, 20)
+
+    # Identical verdicts are the point; speed is only worth having on top of that
+    sys.exit(1 if bad else 0)
+
+if __name__ == "__main__":
+    main()
@@ -219,7 +219,10 @@ namespace UnityVibeBridge.Kernel {
             var request = context.Request;
             var response = context.Response;
             string responseString = "";
+            string streamPayload = null;
             var stopwatch = System.Diagnostics.Stopwatch.StartNew();
+            // NDJSON: header line, then the payload verbatim (no second JSON-string encoding)
+            bool ndjson = (request.Headers["Accept"] ?? "").Contains("application/x-ndjson");
 
             try {
                 if (request.Url.AbsolutePath == "/health") {
@@ -250,13 +253,14 @@ namespace UnityVibeBridge.Kernel {
 
                     _monotonicTick++;
                     var wrapper = new ResponseWrapper {
-                        payload = payload,
+                        payload = ndjson ? null : payload,
                         monotonicTick = _monotonicTick,
                         state = _lastAuditHash,
                         mainThreadBudgetUsed = stopwatch.ElapsedMilliseconds,
                         overBudget = stopwatch.ElapsedMilliseconds > 5
                     };
                     responseString = JsonUtility.ToJson(wrapper);
+                    if (ndjson) streamPayload = payload;
                 }
             } catch (Exception e) {
                 response.StatusCode = (int)HttpStatusCode.InternalServerError;
@@ -269,10 +273,19 @@ namespace UnityVibeBridge.Kernel {
             }
 
             try {
-                byte[] buffer = Encoding.UTF8.GetBytes(responseString);
-                response.ContentLength64 = buffer.Length;
-                response.ContentType = "application/json";
-                response.OutputStream.Write(buffer, 0, buffer.Length);
+                if (streamPayload != null) {
+                    byte[] head = Encoding.UTF8.GetBytes(responseString + "\n");
+                    byte[] body = Encoding.UTF8.GetBytes(streamPayload + "\n");
+                    response.ContentLength64 = head.Length + body.Length;
+                    response.ContentType = "application/x-ndjson";
+                    response.OutputStream.Write(head, 0, head.Length);
+                    response.OutputStream.Write(body, 0, body.Length);
+                } else {
+                    byte[] buffer = Encoding.UTF8.GetBytes(responseString);
+                    response.ContentLength64 = buffer.Length;
+                    response.ContentType = "application/json";
+                    response.OutputStream.Write(buffer, 0, buffer.Length);
+                }
                 response.OutputStream.Close();
             } catch {}
         }